@@ -639,8 +639,11 @@ async def reject_match(
             )
         
         # Update status to verified (not a duplicate)
-        await app_repo.update_status(application_id, ApplicationStatus.VERIFIED)
-        await app_repo.update_result(application_id, {"is_duplicate": False})
+        await app_repo.update_application_atomic(
+            application_id,
+            status=ApplicationStatus.VERIFIED,
+            result_data={"is_duplicate": False}
+        )
         
         logger.info(f"Match rejected for application: {application_id}")
         
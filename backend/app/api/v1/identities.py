@@ -1,5 +1,6 @@
 """Identity management API endpoints"""
 
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends, Query, status
 from typing import List, Dict, Any
 from datetime import datetime
@@ -82,9 +83,9 @@ async def get_identity_applications(
     """
     try:
         identity_repo = IdentityRepository(db)
-        identity = await identity_repo.get_by_unique_id(unique_id)
+        application_ids = await identity_repo.get_application_ids(unique_id)
         
-        if not identity:
+        if application_ids is None:
             error_response = create_error_response(
                 ErrorCode.E203,
                 details={"unique_id": unique_id}
@@ -94,10 +95,27 @@ async def get_identity_applications(
                 detail=error_response.dict()
             )
         
-        # Get associated applications
+        # Get associated applications in one query, keeping the identity's ordering
+        app_docs = {}
+        if application_ids:
+            cursor = db.applications.find(
+                {"application_id": {"$in": application_ids}},
+                {
+                    "_id": 0,
+                    "application_id": 1,
+                    "processing.status": 1,
+                    "created_at": 1,
+                    "applicant_data.name": 1,
+                    "applicant_data.email": 1,
+                    "result.is_duplicate": 1
+                }
+            )
+            async for doc in cursor:
+                app_docs[doc["application_id"]] = doc
+        
         applications = []
-        for app_id in identity.application_ids:
-            app_doc = await db.applications.find_one({"application_id": app_id})
+        for app_id in application_ids:
+            app_doc = app_docs.get(app_id)
             if app_doc:
                 applications.append({
                     "application_id": app_doc.get("application_id"),
@@ -133,7 +151,23 @@ async def get_identity(
     """
     try:
         identity_repo = IdentityRepository(db)
-        identity = await identity_repo.get_by_unique_id(unique_id)
+        
+        # Identity and its applications are independent reads - fetch them concurrently
+        app_cursor = db.applications.find(
+            {"result.identity_id": unique_id},
+            {
+                "_id": 0,
+                "application_id": 1,
+                "processing.status": 1,
+                "created_at": 1,
+                "applicant_data.name": 1
+            }
+        ).sort("created_at", 1)
+        
+        identity, app_docs = await asyncio.gather(
+            identity_repo.get_by_unique_id(unique_id),
+            app_cursor.to_list(length=None)
+        )
         
         if not identity:
             error_response = create_error_response(
@@ -145,17 +179,15 @@ async def get_identity(
                 detail=error_response.dict()
             )
         
-        # Get associated applications
-        applications = []
-        for app_id in identity.application_ids:
-            app_doc = await db.applications.find_one({"application_id": app_id})
-            if app_doc:
-                applications.append({
-                    "application_id": app_doc.get("application_id"),
-                    "status": app_doc.get("processing", {}).get("status"),
-                    "created_at": app_doc.get("created_at").isoformat() if app_doc.get("created_at") else None,
-                    "applicant_name": app_doc.get("applicant_data", {}).get("name")
-                })
+        applications = [
+            {
+                "application_id": app_doc.get("application_id"),
+                "status": app_doc.get("processing", {}).get("status"),
+                "created_at": app_doc.get("created_at").isoformat() if app_doc.get("created_at") else None,
+                "applicant_name": app_doc.get("applicant_data", {}).get("name")
+            }
+            for app_doc in app_docs
+        ]
         
         return {
             "unique_id": identity.unique_id,
@@ -13,6 +13,10 @@ class Settings(BaseSettings):
     # MongoDB Configuration
     MONGODB_URI: str
     MONGODB_DATABASE: str = "face_auth_db"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 2000
+    MONGODB_MAX_IDLE_TIME_MS: int = 60000
     
     # Redis Configuration
     REDIS_URL: str = "redis://localhost:6379"
@@ -29,6 +33,19 @@ class Settings(BaseSettings):
     EMBEDDING_DIMENSION: int = 512
     FACE_DETECTION_MODEL: str = "mtcnn"  # or 'hog', 'cnn'
     
+    # Vector Index Configuration
+    FAISS_INDEX_TYPE: str = "ivf"  # 'flat', 'ivf', 'ivfsq8', 'hnsw', 'ivfpq', 'ivfpqfs' or 'sq8'
+    FAISS_NLIST: int = 100
+    FAISS_NPROBE: int = 10
+    FAISS_HNSW_M: int = 32
+    FAISS_HNSW_EF_CONSTRUCTION: int = 100
+    FAISS_HNSW_EF_SEARCH: int = 64
+    FAISS_PQ_M: int = 32  # PQ sub-quantizers (must divide EMBEDDING_DIMENSION)
+    FAISS_REFINE_FACTOR: int = 10  # ivfsq8/ivfpq/ivfpqfs/sq8: re-rank k * factor candidates exactly
+    FAISS_USE_GPU: bool = False  # Search a GPU mirror of the index (requires faiss-gpu)
+    FAISS_MMAP: bool = False  # Memory-map the index file on load instead of reading it into RAM
+    FAISS_OMP_THREADS: int = 0  # FAISS OpenMP threads per process (0 = CPU count / API_WORKERS)
+    
     # API Configuration
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
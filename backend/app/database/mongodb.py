@@ -1,10 +1,13 @@
 """MongoDB connection manager with connection pooling and error handling"""
 
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
-from typing import Optional
+from typing import Optional, Dict, Any
 import asyncio
 import ssl
+import threading
+import time
 from app.core.config import settings
 from app.core.logging import logger
 
@@ -16,6 +19,79 @@ except ImportError:
     CA_BUNDLE = None
 
 
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Tracks connection checkouts and wait time for pool sizing"""
+    
+    def __init__(self):
+        self.in_use = 0
+        self.total_checkouts = 0
+        self.checkout_failures = 0
+        self.connections_created = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._checkout_started: Dict[int, float] = {}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics"""
+        avg_wait = self.total_wait_ms / self.total_checkouts if self.total_checkouts else 0.0
+        return {
+            "in_use": self.in_use,
+            "total_checkouts": self.total_checkouts,
+            "checkout_failures": self.checkout_failures,
+            "connections_created": self.connections_created,
+            "avg_wait_ms": round(avg_wait, 3),
+            "max_wait_ms": round(self.max_wait_ms, 3)
+        }
+    
+    def _record_wait(self):
+        started = self._checkout_started.pop(self._thread_key(), None)
+        if started is not None:
+            wait_ms = (time.perf_counter() - started) * 1000
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+    
+    @staticmethod
+    def _thread_key() -> int:
+        # Checkout start/finish events for one operation fire on the same thread
+        return threading.get_ident()
+    
+    def connection_check_out_started(self, event):
+        self._checkout_started[self._thread_key()] = time.perf_counter()
+    
+    def connection_checked_out(self, event):
+        self._record_wait()
+        self.in_use += 1
+        self.total_checkouts += 1
+    
+    def connection_check_out_failed(self, event):
+        self._record_wait()
+        self.checkout_failures += 1
+    
+    def connection_checked_in(self, event):
+        self.in_use = max(0, self.in_use - 1)
+    
+    def connection_created(self, event):
+        self.connections_created += 1
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        pass
+
+
 class MongoDBManager:
     """MongoDB connection manager with connection pooling"""
     
@@ -24,6 +100,7 @@ class MongoDBManager:
         self.db = None
         self._connection_retries = 3
         self._retry_delay = 2  # seconds
+        self.pool_metrics = PoolMetricsListener()
     
     async def connect(self):
         """Establish connection to MongoDB with retry logic"""
@@ -31,13 +108,16 @@ class MongoDBManager:
             try:
                 logger.info(f"Attempting MongoDB connection (attempt {attempt + 1}/{self._connection_retries})")
                 
-                # Create client with connection pooling and SSL/TLS configuration
+                # Create a single shared client with connection pooling and SSL/TLS configuration
                 client_kwargs = {
-                    "maxPoolSize": 50,
-                    "minPoolSize": 10,
+                    "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+                    "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+                    "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+                    "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
                     "serverSelectionTimeoutMS": 5000,
                     "connectTimeoutMS": 10000,
                     "retryWrites": True,
+                    "event_listeners": [self.pool_metrics],
                 }
                 
                 # Add SSL/TLS configuration for MongoDB Atlas with Python 3.13 workaround
@@ -145,6 +225,13 @@ class MongoDBManager:
             raise RuntimeError("MongoDB not connected")
         return self.db[collection_name]
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage statistics"""
+        stats = self.pool_metrics.get_stats()
+        stats["max_pool_size"] = settings.MONGODB_MAX_POOL_SIZE
+        stats["min_pool_size"] = settings.MONGODB_MIN_POOL_SIZE
+        return stats
+    
     async def health_check(self) -> bool:
         """Check if MongoDB connection is healthy"""
         try:
@@ -1,8 +1,9 @@
 """Database repository classes for CRUD operations"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 from pymongo.errors import DuplicateKeyError
 from app.models.application import Application, ApplicationStatus
 from app.models.identity import Identity, IdentityEmbedding, IdentityStatus
@@ -15,6 +16,9 @@ from app.services.cache_service import cache_service
 class ApplicationRepository:
     """Repository for application CRUD operations"""
     
+    # Fields the review screens never read: stored embeddings and all but the top match
+    LITE_PROJECTION = {"embedding": 0, "result.matched_applications": {"$slice": 1}}
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db.applications
     
@@ -59,6 +63,91 @@ class ApplicationRepository:
             return Application(**doc)
         return None
     
+    async def get_by_id_lite(self, application_id: str,
+                             projection: Optional[Dict[str, Any]] = None) -> Optional[Application]:
+        """
+        Get application by ID without the heavy fields used only by processing
+        
+        A cached full document is served as-is; projected documents are
+        never written to the cache since they are partial.
+        """
+        cached = cache_service.get(f"app:{application_id}")
+        if cached:
+            return Application(**cached)
+        
+        doc = await self.collection.find_one(
+            {"application_id": application_id},
+            projection or self.LITE_PROJECTION
+        )
+        if doc:
+            doc.pop("_id", None)
+            return Application(**doc)
+        return None
+    
+    async def get_comparison_pair(
+        self, application_id: str
+    ) -> Tuple[Optional[Application], Optional[Application]]:
+        """
+        Get an application together with its top matched application
+        
+        When the application is not cached, both documents come back from
+        one aggregation that joins the top match server-side ($lookup).
+        
+        Returns:
+            Tuple of (application, matched application); either may be None
+        """
+        if cache_service.get(f"app:{application_id}"):
+            current = await self.get_by_id_lite(application_id)
+            if current is None:
+                return None, None
+            matches = current.result.matched_applications
+            matched = await self.get_by_id_lite(matches[0].matched_application_id) if matches else None
+            return current, matched
+        
+        pipeline = [
+            {"$match": {"application_id": application_id}},
+            {"$limit": 1},
+            # Keep only the top match; the join below then keys on a single ID
+            {"$set": {"result.matched_applications": {
+                "$slice": [{"$ifNull": ["$result.matched_applications", []]}, 1]
+            }}},
+            {"$lookup": {
+                "from": "applications",
+                "localField": "result.matched_applications.matched_application_id",
+                "foreignField": "application_id",
+                "as": "matched"
+            }},
+            {"$unwind": {"path": "$matched", "preserveNullAndEmptyArrays": True}},
+            {"$unset": ["_id", "embedding", "matched._id", "matched.embedding"]}
+        ]
+        
+        async for doc in self.collection.aggregate(pipeline):
+            matched_doc = doc.pop("matched", None)
+            return Application(**doc), Application(**matched_doc) if matched_doc else None
+        
+        return None, None
+    
+    async def get_many_by_ids(self, application_ids: List[str]) -> Dict[str, Application]:
+        """Get several applications by ID (cache first, then a single $in query)"""
+        applications = {}
+        missing = []
+        
+        for application_id in dict.fromkeys(application_ids):
+            cached = cache_service.get(f"app:{application_id}")
+            if cached:
+                applications[application_id] = Application(**cached)
+            else:
+                missing.append(application_id)
+        
+        if missing:
+            cursor = self.collection.find({"application_id": {"$in": missing}})
+            async for doc in cursor:
+                doc.pop("_id", None)
+                cache_service.set(f"app:{doc['application_id']}", doc, ttl=300)
+                applications[doc["application_id"]] = Application(**doc)
+        
+        return applications
+    
     async def update_status(self, application_id: str, status: ApplicationStatus, 
                            error_code: Optional[str] = None, 
                            error_message: Optional[str] = None) -> bool:
@@ -117,15 +206,113 @@ class ApplicationRepository:
         
         return result.modified_count > 0
     
-    async def get_by_status(self, status: ApplicationStatus, 
-                           limit: int = 100, skip: int = 0) -> List[Application]:
-        """Get applications by status"""
+    async def update_application_atomic(self, application_id: str,
+                                        status: Optional[ApplicationStatus] = None,
+                                        result_data: Optional[Dict[str, Any]] = None,
+                                        processing_metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Update status, result and processing metadata in a single write"""
+        update_data = {}
+        
+        if status is not None:
+            update_data["processing.status"] = status
+        if result_data:
+            update_data.update({f"result.{k}": v for k, v in result_data.items()})
+        if processing_metadata:
+            update_data.update({f"processing.{k}": v for k, v in processing_metadata.items()})
+        
+        update_data["updated_at"] = datetime.utcnow()
+        
+        result = await self.collection.update_one(
+            {"application_id": application_id},
+            {"$set": update_data}
+        )
+        
+        # Invalidate cache on update
+        if result.modified_count > 0:
+            cache_service.delete(f"app:{application_id}")
+        
+        return result.modified_count > 0
+    
+    async def update_applications_bulk(
+        self,
+        updates: List[Tuple[str, Optional[ApplicationStatus], Optional[Dict[str, Any]]]]
+    ) -> int:
+        """Apply (application_id, status, result_data) updates in one bulk_write"""
+        if not updates:
+            return 0
+        
+        now = datetime.utcnow()
+        operations = []
+        for application_id, status, result_data in updates:
+            update_data = {f"result.{k}": v for k, v in (result_data or {}).items()}
+            if status is not None:
+                update_data["processing.status"] = status
+            update_data["updated_at"] = now
+            operations.append(UpdateOne({"application_id": application_id}, {"$set": update_data}))
+        
+        result = await self.collection.bulk_write(operations, ordered=False)
+        
+        # Invalidate cache for every touched application
+        for application_id, _, _ in updates:
+            cache_service.delete(f"app:{application_id}")
+        
+        return result.modified_count
+    
+    async def iter_by_status(self, status: ApplicationStatus,
+                             limit: int = 100, skip: int = 0) -> AsyncIterator[Application]:
+        """Stream applications by status straight off the cursor"""
         cursor = self.collection.find({"processing.status": status}).skip(skip).limit(limit)
-        applications = []
         async for doc in cursor:
             doc.pop("_id", None)
-            applications.append(Application(**doc))
-        return applications
+            yield Application(**doc)
+    
+    async def iter_review_rows(self, status: ApplicationStatus,
+                               limit: int = 100, skip: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the few fields a review list row shows, as raw documents
+        
+        Skips Application validation entirely; documents carry only
+        application_id, applicant_data.name, the top match, created_at
+        and result.review_reason.
+        """
+        projection = {
+            "_id": 0,
+            "application_id": 1,
+            "applicant_data.name": 1,
+            "result.matched_applications": {"$slice": 1},
+            "result.review_reason": 1,
+            "created_at": 1
+        }
+        cursor = self.collection.find({"processing.status": status}, projection).skip(skip).limit(limit)
+        async for doc in cursor:
+            yield doc
+    
+    async def get_by_status(self, status: ApplicationStatus, 
+                           limit: int = 100, skip: int = 0) -> List[Application]:
+        """Get applications by status"""
+        return [application async for application in self.iter_by_status(status, limit, skip)]
+    
+    async def count_and_avg_age(self, status: ApplicationStatus) -> Tuple[int, float]:
+        """
+        Count applications in a status and their average age, server-side
+        
+        Returns:
+            Tuple of (count, average age in days)
+        """
+        pipeline = [
+            {"$match": {"processing.status": status}},
+            {"$group": {
+                "_id": None,
+                "count": {"$sum": 1},
+                # Date subtraction yields milliseconds
+                "avg_age_ms": {"$avg": {"$subtract": ["$$NOW", "$created_at"]}}
+            }}
+        ]
+        
+        async for doc in self.collection.aggregate(pipeline):
+            return doc["count"], (doc["avg_age_ms"] or 0) / 86_400_000
+        
+        return 0, 0.0
     
     async def get_by_identity_id(self, identity_id: str) -> List[Application]:
         """Get all applications for an identity"""
@@ -223,6 +410,28 @@ class IdentityRepository:
             return Identity(**doc)
         return None
     
+    async def get_application_ids(self, unique_id: str, skip: int = 0,
+                                  limit: Optional[int] = None) -> Optional[List[str]]:
+        """Get only the application IDs of an identity (None if identity not found)"""
+        # Serve from the full cached document when available
+        cached = cache_service.get(f"identity:{unique_id}")
+        if cached:
+            application_ids = cached.get("application_ids", [])
+            return application_ids[skip:skip + limit] if limit is not None else application_ids[skip:]
+        
+        # Project just the array (sliced server-side when paginated) instead of the whole document
+        if limit is not None:
+            projection = {"application_ids": {"$slice": [skip, limit]}, "unique_id": 1, "_id": 0}
+        else:
+            projection = {"application_ids": 1, "_id": 0}
+        
+        doc = await self.collection.find_one({"unique_id": unique_id}, projection)
+        if doc is None:
+            return None
+        
+        application_ids = doc.get("application_ids", [])
+        return application_ids[skip:] if limit is None and skip else application_ids
+    
     async def update_status(self, unique_id: str, status: IdentityStatus) -> bool:
         """Update identity status"""
         result = await self.collection.update_one(
@@ -318,6 +527,14 @@ class AuditLogRepository:
         result = await self.collection.insert_one(audit_dict)
         return str(result.inserted_id)
     
+    async def create_many(self, audit_logs: List[AuditLog]) -> List[str]:
+        """Create several audit log entries with one insert_many"""
+        if not audit_logs:
+            return []
+        
+        result = await self.collection.insert_many([log.model_dump() for log in audit_logs])
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    
     async def get_by_event_type(self, event_type: EventType, 
                                 limit: int = 100, skip: int = 0) -> List[AuditLog]:
         """Get audit logs by event type"""
@@ -2,7 +2,7 @@
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 import os
@@ -59,6 +59,9 @@ app = FastAPI(
     license_info={
         "name": "Proprietary",
     },
+    # orjson encodes datetimes (and numpy values) natively, so services can
+    # return raw datetime objects instead of pre-formatting them
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiter to app state
@@ -213,6 +216,15 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error stopping application processor: {str(e)}")
     
+    # Close pooled webhook connections
+    from app.services.notification_service import notification_service
+    await notification_service.close()
+    
+    # Checkpoint the vector index and close its write-ahead log (if it was loaded)
+    from app.services.vector_index_service import get_vector_index_service
+    if get_vector_index_service.cache_info().currsize:
+        get_vector_index_service().close()
+    
     # Disconnect from MongoDB
     await mongodb_manager.disconnect()
 
@@ -1,6 +1,6 @@
 """Application data models"""
 
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, model_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -24,6 +24,16 @@ class ApplicantData(BaseModel):
     phone: str = Field(..., pattern=r"^\+?[1-9]\d{1,14}$")
     address: Optional[str] = None
     demographic_data: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    # Case-folded copies stored alongside the originals for cheap exact matching
+    name_lower: Optional[str] = Field(None, description="Case-folded name (derived)")
+    email_lower: Optional[str] = Field(None, description="Case-folded email (derived)")
+    
+    @model_validator(mode="after")
+    def fold_case(self):
+        """Derive the case-folded fields from name and email"""
+        self.name_lower = self.name.casefold()
+        self.email_lower = self.email.casefold()
+        return self
 
 
 class PhotographMetadata(BaseModel):
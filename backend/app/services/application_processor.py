@@ -1,7 +1,7 @@
 """End-to-end application processing orchestrator"""
 
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set, Coroutine
 from datetime import datetime
 import numpy as np
 
@@ -13,12 +13,14 @@ from app.services.face_detection_service import face_detection_service, FaceDete
 from app.services.face_embedding_service import face_embedding_service
 from app.services.deduplication_service import deduplication_service
 from app.services.identity_service import identity_service
-from app.services.vector_index_service import vector_index_service
+from app.services.vector_index_service import get_vector_index_service
 from app.services.audit_service import audit_service
 from app.services.notification_service import notification_service
 from app.services.websocket_manager import websocket_manager
+from app.database.mongodb import get_database
 from app.database.repositories import ApplicationRepository, IdentityRepository, EmbeddingRepository
 from app.models.application import ApplicationStatus
+from app.models.identity import IdentityEmbedding
 from app.utils.error_responses import ErrorCode
 
 
@@ -37,6 +39,32 @@ class ApplicationProcessor:
         self.max_retries = 3
         self.processing_delay = 0.1
         
+        # Fire-and-forget side effects (audit, webhooks) still in flight
+        self._pending_tasks: Set[asyncio.Task] = set()
+        self.max_pending_tasks = 1000
+    
+    async def _run_in_background(self, coro: Coroutine):
+        """
+        Run a side effect without blocking the processing result
+        
+        The task is tracked so it is not garbage collected and can be awaited
+        on shutdown. When too many tasks are pending, the coroutine is awaited
+        inline instead to apply backpressure.
+        """
+        if len(self._pending_tasks) >= self.max_pending_tasks:
+            await coro
+            return
+        
+        task = asyncio.create_task(coro)
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+    
+    def _on_background_task_done(self, task: asyncio.Task):
+        """Forget a finished background task and log its failure"""
+        self._pending_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background task failed: {str(task.exception())}")
+    
     async def process_application_end_to_end(
         self, 
         application_id: str,
@@ -239,9 +267,9 @@ class ApplicationProcessor:
                     identity_id = matched_app.result.identity_id
                     
                     # Link application to existing identity
-                    await identity_service.link_application_to_identity(
+                    await identity_service.add_application_to_identity(
                         db=db,
-                        identity_id=identity_id,
+                        unique_id=identity_id,
                         application_id=application_id
                     )
                     
@@ -277,9 +305,10 @@ class ApplicationProcessor:
                 logger.info(f"[{application_id}] Stage 4: Created new identity {identity_id}")
             
             # ===== STAGE 5: Finalization =====
-            # Update application with final result
-            await app_repo.update_result(
+            # Update application with final result and status in one write
+            await app_repo.update_application_atomic(
                 application_id=application_id,
+                status=final_status,
                 result_data={
                     "is_duplicate": dedup_result.is_duplicate,
                     "identity_id": identity_id,
@@ -289,19 +318,15 @@ class ApplicationProcessor:
                 }
             )
             
-            # Update final status
-            await app_repo.update_status(
-                application_id=application_id,
-                status=final_status
-            )
-            
-            # Log completion to audit trail
-            await audit_service.log_application_completion(
-                db=db,
-                application_id=application_id,
-                identity_id=identity_id,
-                is_duplicate=dedup_result.is_duplicate,
-                status=final_status.value
+            # Log completion to audit trail (does not affect the result)
+            await self._run_in_background(
+                audit_service.log_application_completion(
+                    db=db,
+                    application_id=application_id,
+                    identity_id=identity_id,
+                    is_duplicate=dedup_result.is_duplicate,
+                    status=final_status.value
+                )
             )
             
             logger.info(
@@ -321,34 +346,40 @@ class ApplicationProcessor:
                 }
             )
             
-            # Send completion notification
+            # Send completion notifications (webhook retries must not hold up processing)
             if webhook_url:
-                await notification_service.notify_application_status(
-                    application_id=application_id,
-                    status=final_status.value.lower(),
-                    webhook_url=webhook_url,
-                    additional_data={
-                        "identity_id": identity_id,
-                        "is_duplicate": dedup_result.is_duplicate,
-                        "requires_manual_review": dedup_result.requires_manual_review
-                    }
+                await self._run_in_background(
+                    notification_service.notify_application_status(
+                        application_id=application_id,
+                        status=final_status.value.lower(),
+                        webhook_url=webhook_url,
+                        additional_data={
+                            "identity_id": identity_id,
+                            "is_duplicate": dedup_result.is_duplicate,
+                            "requires_manual_review": dedup_result.requires_manual_review
+                        }
+                    )
                 )
                 
                 # Send identity created notification if new identity
                 if not dedup_result.is_duplicate:
-                    await notification_service.notify_identity_created(
-                        identity_id=identity_id,
-                        application_id=application_id,
-                        webhook_url=webhook_url
+                    await self._run_in_background(
+                        notification_service.notify_identity_created(
+                            identity_id=identity_id,
+                            application_id=application_id,
+                            webhook_url=webhook_url
+                        )
                     )
                 
                 # Send duplicate detected notification if duplicate
                 if dedup_result.is_duplicate and dedup_result.matches:
-                    await notification_service.notify_duplicate_detected(
-                        application_id=application_id,
-                        matched_application_id=dedup_result.matches[0].matched_application_id,
-                        confidence_score=dedup_result.matches[0].confidence_score,
-                        webhook_url=webhook_url
+                    await self._run_in_background(
+                        notification_service.notify_duplicate_detected(
+                            application_id=application_id,
+                            matched_application_id=dedup_result.matches[0].matched_application_id,
+                            confidence_score=dedup_result.matches[0].confidence_score,
+                            webhook_url=webhook_url
+                        )
                     )
             
             return {
@@ -390,13 +421,12 @@ class ApplicationProcessor:
         )
         
         # Store embedding in vector index
-        vector_index_service.add_embedding(
+        await get_vector_index_service().add_embedding_async(
             application_id=application_id,
             embedding=embedding
         )
         
         # Store embedding in database
-        from app.models.identity import IdentityEmbedding
         embedding_doc = IdentityEmbedding(
             identity_id=identity_id,
             application_id=application_id,
@@ -485,7 +515,6 @@ class ApplicationProcessor:
                     retry_count = application_data.get("retry_count", 0)
                     
                     # Get database connection
-                    from app.database.mongodb import get_database
                     db = await get_database()
                     
                     # Process application
@@ -531,12 +560,18 @@ class ApplicationProcessor:
         """Stop the application processor"""
         logger.info("Stopping application processor...")
         self.is_running = False
+        
+        # Let in-flight audit writes and notifications finish
+        if self._pending_tasks:
+            logger.info(f"Waiting for {len(self._pending_tasks)} background tasks to complete")
+            await asyncio.gather(*self._pending_tasks, return_exceptions=True)
     
     def get_status(self) -> Dict[str, Any]:
         """Get processor status"""
         return {
             "is_running": self.is_running,
-            "max_retries": self.max_retries
+            "max_retries": self.max_retries,
+            "pending_background_tasks": len(self._pending_tasks)
         }
 
 
@@ -83,6 +83,69 @@ class AuditService:
             logger.error(f"Failed to create audit log: {str(e)}")
             return None
     
+    async def log_many(self, db, audit_logs: List[AuditLog]) -> List[str]:
+        """
+        Store several audit log entries in a single insert
+        
+        Args:
+            db: Database connection
+            audit_logs: Audit log entries to store
+            
+        Returns:
+            List of created audit log IDs (empty on failure)
+        """
+        try:
+            audit_repo = self._get_audit_repo(db)
+            log_ids = await audit_repo.create_many(audit_logs)
+            
+            logger.debug(f"Created {len(log_ids)} audit logs in batch")
+            
+            return log_ids
+            
+        except Exception as e:
+            logger.error(f"Failed to create audit logs in batch: {str(e)}")
+            return []
+    
+    def build_override_log(
+        self,
+        application_id: str,
+        admin_id: str,
+        decision: str,
+        justification: str,
+        original_status: str,
+        new_status: str
+    ) -> AuditLog:
+        """
+        Build (without storing) the audit entry for an override decision
+        
+        Args:
+            application_id: Application identifier
+            admin_id: Admin user ID
+            decision: Override decision
+            justification: Justification for decision
+            original_status: Original application status
+            new_status: New application status
+            
+        Returns:
+            AuditLog ready to be passed to log_many
+        """
+        return AuditLog(
+            event_type=EventType.DUPLICATE_OVERRIDE,
+            timestamp=datetime.utcnow(),
+            actor_id=admin_id,
+            actor_type=ActorType.ADMIN,
+            resource_id=application_id,
+            resource_type=ResourceType.APPLICATION,
+            action=f"Override decision: {decision}",
+            details={
+                "decision": decision,
+                "justification": justification,
+                "original_status": original_status,
+                "new_status": new_status
+            },
+            success=True
+        )
+    
     async def log_override_decision(
         self,
         db,
@@ -21,15 +21,17 @@ class CacheEntry:
 class SimpleCacheService:
     """Simple in-memory cache with TTL support for read-heavy operations"""
     
-    def __init__(self, default_ttl: int = 3600):
+    def __init__(self, default_ttl: int = 3600, max_size: Optional[int] = None):
         """
         Initialize cache service
         
         Args:
             default_ttl: Default time-to-live in seconds (default: 1 hour)
+            max_size: Optional maximum number of entries (oldest evicted first)
         """
         self._cache: Dict[str, CacheEntry] = {}
         self.default_ttl = default_ttl
+        self.max_size = max_size
         self._hits = 0
         self._misses = 0
         self._evictions = 0
@@ -72,6 +74,12 @@ class SimpleCacheService:
             ttl: Time-to-live in seconds (uses default if not specified)
         """
         ttl_seconds = ttl if ttl is not None else self.default_ttl
+        
+        # Evict oldest entry when bounded cache is full
+        if self.max_size is not None and key not in self._cache and len(self._cache) >= self.max_size:
+            del self._cache[next(iter(self._cache))]
+            self._evictions += 1
+        
         self._cache[key] = CacheEntry(value, ttl_seconds)
     
     def delete(self, key: str) -> bool:
@@ -7,7 +7,7 @@ from datetime import datetime
 
 from app.core.config import settings
 from app.core.logging import logger
-from app.services.vector_index_service import vector_index_service
+from app.services.vector_index_service import get_vector_index_service
 from app.services.performance_monitor import performance_monitor, PerformanceTimer, MetricType
 from app.models.application import MatchResult
 from app.services.audit_service import audit_service
@@ -145,7 +145,7 @@ class DeduplicationService:
             # Search for similar embeddings with performance monitoring
             with PerformanceTimer(performance_monitor, MetricType.VECTOR_INDEX_QUERY, 
                                  {"application_id": application_id, "k": self.top_k_candidates}):
-                matches = vector_index_service.search_similar(
+                matches = await get_vector_index_service().search_similar_async(
                     query_embedding=embedding,
                     k=self.top_k_candidates,
                     threshold=None  # Get all matches, filter later
@@ -281,17 +281,14 @@ class DeduplicationService:
             Tuple of (is_duplicate, similarity_score)
         """
         try:
-            # Get embeddings from index
-            index_id1 = vector_index_service.get_index_id(application_id1)
-            index_id2 = vector_index_service.get_index_id(application_id2)
+            # Get stored embeddings from the index
+            vector_index_service = get_vector_index_service()
+            embedding1 = vector_index_service.get_embedding(application_id1)
+            embedding2 = vector_index_service.get_embedding(application_id2)
             
-            if index_id1 is None or index_id2 is None:
+            if embedding1 is None or embedding2 is None:
                 raise ValueError("One or both applications not found in index")
             
-            # Reconstruct embeddings
-            embedding1 = vector_index_service.index.reconstruct(int(index_id1))
-            embedding2 = vector_index_service.index.reconstruct(int(index_id2))
-            
             # Compare embeddings
             similarity = self.compare_embeddings(embedding1, embedding2)
             
@@ -306,18 +303,24 @@ class DeduplicationService:
             logger.error(f"Match verification failed: {str(e)}")
             raise
     
-    def rank_matches_by_confidence(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def rank_matches_by_confidence(self, matches: List[Dict[str, Any]],
+                                   presorted: bool = False) -> List[Dict[str, Any]]:
         """
         Rank matches by confidence score in descending order.
         
         Args:
             matches: List of match dictionaries with 'similarity' scores
+            presorted: Matches are already in descending similarity order
+                (as returned by the vector index), so skip the sort
             
         Returns:
             Sorted list of matches (highest confidence first)
         """
         # Sort by similarity score in descending order
-        ranked_matches = sorted(matches, key=lambda x: x.get("similarity", 0.0), reverse=True)
+        if presorted:
+            ranked_matches = matches
+        else:
+            ranked_matches = sorted(matches, key=lambda x: x.get("similarity", 0.0), reverse=True)
         
         # Add rank information
         for i, match in enumerate(ranked_matches, start=1):
@@ -342,14 +345,14 @@ class DeduplicationService:
             # Search using existing application
             threshold = None if include_low_confidence else self.verification_threshold
             
-            matches = vector_index_service.search_by_application_id(
+            matches = get_vector_index_service().search_by_application_id(
                 application_id=application_id,
                 k=self.top_k_candidates,
                 threshold=threshold
             )
             
-            # Rank matches by confidence score
-            ranked_matches = self.rank_matches_by_confidence(matches)
+            # Rank matches by confidence score (index results are already ordered)
+            ranked_matches = self.rank_matches_by_confidence(matches, presorted=True)
             
             # Add additional metadata
             for match in ranked_matches:
@@ -370,7 +373,7 @@ class DeduplicationService:
         Returns:
             Dictionary with service statistics
         """
-        index_stats = vector_index_service.get_stats()
+        index_stats = get_vector_index_service().get_stats()
         
         return {
             "verification_threshold": self.verification_threshold,
@@ -5,7 +5,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from app.core.logging import logger
-from app.services.vector_index_service import vector_index_service
+from app.services.vector_index_service import get_vector_index_service
 from app.database.repositories import EmbeddingRepository
 from app.models.identity import IdentityEmbedding, EmbeddingMetadata, FaceBoundingBox
 
@@ -39,7 +39,7 @@ class EmbeddingStorageService:
             embedding_np = np.array(embedding, dtype=np.float32)
             
             # Add to FAISS index
-            index_id = vector_index_service.add_embedding(application_id, embedding_np)
+            index_id = await get_vector_index_service().add_embedding_async(application_id, embedding_np)
             
             logger.info(f"Added embedding to FAISS index: application={application_id}, index_id={index_id}")
             
@@ -134,7 +134,7 @@ class EmbeddingStorageService:
             
             # Batch insert into FAISS
             if faiss_data:
-                index_ids = vector_index_service.add_embeddings_batch(faiss_data)
+                index_ids = get_vector_index_service().add_embeddings_batch(faiss_data)
                 logger.info(f"Added {len(index_ids)} embeddings to FAISS index in batch")
             
             # Batch insert into MongoDB
@@ -200,12 +200,7 @@ class EmbeddingStorageService:
             Embedding vector or None if not found
         """
         try:
-            index_id = vector_index_service.get_index_id(application_id)
-            if index_id is None:
-                return None
-            
-            embedding = vector_index_service.index.reconstruct(int(index_id))
-            return embedding
+            return get_vector_index_service().get_embedding(application_id)
             
         except Exception as e:
             logger.error(f"Failed to get embedding from index: {str(e)}")
@@ -223,7 +218,7 @@ class EmbeddingStorageService:
         """
         try:
             # Remove from FAISS index
-            vector_index_service.remove_embedding(application_id)
+            get_vector_index_service().remove_embedding(application_id)
             
             # Note: MongoDB deletion would need to be implemented in repository
             # For now, we just remove from FAISS
@@ -242,7 +237,7 @@ class EmbeddingStorageService:
         Returns:
             Dictionary with storage statistics
         """
-        index_stats = vector_index_service.get_stats()
+        index_stats = get_vector_index_service().get_stats()
         
         return {
             "faiss_index": index_stats,
@@ -31,7 +31,8 @@ class HealthCheckService:
             return {
                 "status": "ok" if is_healthy else "failed",
                 "message": "Database connection healthy" if is_healthy else "Database connection failed",
-                "type": "mongodb"
+                "type": "mongodb",
+                "pool": mongodb_manager.get_pool_stats()
             }
         except Exception as e:
             logger.error(f"Database health check failed: {str(e)}")
@@ -92,9 +93,9 @@ class HealthCheckService:
             Dictionary with status and details
         """
         try:
-            from app.services.vector_index_service import vector_index_service
+            from app.services.vector_index_service import get_vector_index_service
             
-            stats = vector_index_service.get_stats()
+            stats = get_vector_index_service().get_stats()
             
             return {
                 "status": "ok",
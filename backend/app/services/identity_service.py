@@ -1,6 +1,7 @@
 """Identity management service for creating and managing unique applicant identities"""
 
-import uuid
+import asyncio
+from uuid import uuid4 as _uuid4
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
@@ -9,12 +10,27 @@ from app.database.repositories import IdentityRepository, ApplicationRepository
 from app.models.identity import Identity, IdentityStatus
 from app.models.application import ApplicationStatus
 from app.services.audit_service import audit_service
+from app.services.cache_service import SimpleCacheService
 
 
 class IdentityService:
     """Service for managing applicant identities"""
     
     def __init__(self):
+        # Short-lived cache of hot identities (invalidated on every write)
+        self._identity_cache = SimpleCacheService(default_ttl=60, max_size=100_000)
+        
+        # In-flight lookups so concurrent cache misses share one database read
+        self._pending_lookups: Dict[str, asyncio.Future] = {}
+        
+        # Invalidations seen while a lookup is in flight, so a fetch that
+        # raced a write does not cache what it read (entries live only as
+        # long as the lookup)
+        self._lookup_generations: Dict[str, int] = {}
+        
+        # Bound on ID regeneration when a UUID collision is detected
+        self.max_id_attempts = 3
+        
         logger.info("Identity service initialized")
     
     def _get_identity_repo(self, db):
@@ -25,6 +41,12 @@ class IdentityService:
         """Get application repository instance with database connection"""
         return ApplicationRepository(db)
     
+    def _invalidate_identity(self, unique_id: str):
+        """Drop a cached identity after it has been modified"""
+        self._identity_cache.delete(unique_id)
+        if unique_id in self._lookup_generations:
+            self._lookup_generations[unique_id] += 1
+    
     def generate_unique_id(self) -> str:
         """
         Generate a unique identifier using UUID v4
@@ -32,8 +54,9 @@ class IdentityService:
         Returns:
             UUID v4 string
         """
-        unique_id = str(uuid.uuid4())
-        logger.debug(f"Generated unique ID: {unique_id}")
+        unique_id = str(_uuid4())
+        # Deferred formatting: skipped entirely when DEBUG is disabled
+        logger.debug("Generated unique ID: {}", unique_id)
         return unique_id
     
     async def create_identity(self, db, application_id: str, 
@@ -55,17 +78,19 @@ class IdentityService:
         try:
             identity_repo = self._get_identity_repo(db)
             
-            # Generate unique ID
-            unique_id = self.generate_unique_id()
-            
-            # Validate uniqueness (check if ID already exists)
-            existing_identity = await identity_repo.get_by_unique_id(unique_id)
-            
-            # In the extremely rare case of collision, regenerate
-            while existing_identity is not None:
-                logger.warning(f"UUID collision detected: {unique_id}. Regenerating...")
+            # Generate unique ID, regenerating (with backoff) in the extremely rare case of collision
+            for attempt in range(self.max_id_attempts):
                 unique_id = self.generate_unique_id()
+                
+                # Validate uniqueness (check if ID already exists)
                 existing_identity = await identity_repo.get_by_unique_id(unique_id)
+                if existing_identity is None:
+                    break
+                
+                logger.warning("UUID collision detected: {}. Regenerating...", unique_id)
+                await asyncio.sleep(2 ** attempt * 0.001)
+            else:
+                raise ValueError("UUID generation exhausted retries")
             
             # Create identity document
             identity = Identity(
@@ -78,7 +103,7 @@ class IdentityService:
             # Store in database
             await identity_repo.create(identity)
             
-            logger.info(f"Created new identity: {unique_id} for application: {application_id}")
+            logger.info("Created new identity: {} for application: {}", unique_id, application_id)
             
             # Log identity issuance to audit trail
             await audit_service.log_identity_issued(
@@ -90,25 +115,61 @@ class IdentityService:
             return identity
             
         except Exception as e:
-            logger.error(f"Failed to create identity: {str(e)}")
+            logger.error("Failed to create identity: {}", e)
             raise ValueError(f"Identity creation failed: {str(e)}")
     
     async def get_identity(self, db, unique_id: str) -> Optional[Identity]:
         """
-        Get identity by unique ID
+        Get identity by unique ID (served from cache when possible)
         
         Args:
+            db: Database connection
             unique_id: Identity unique identifier
             
         Returns:
-            Identity object or None if not found
+            Identity object (a copy the caller may modify) or None if not found
         """
+        cached = self._identity_cache.get(unique_id)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+        
+        # Another task is already fetching this identity - wait for its result
+        pending = self._pending_lookups.get(unique_id)
+        if pending is not None:
+            try:
+                identity = await asyncio.shield(pending)
+                return identity.model_copy(deep=True) if identity else None
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The fetching task was cancelled - look it up ourselves
+                return await self.get_identity(db, unique_id)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending_lookups[unique_id] = future
+        self._lookup_generations[unique_id] = 0
+        
         try:
+            identity_repo = self._get_identity_repo(db)
             identity = await identity_repo.get_by_unique_id(unique_id)
+            
+            # Only cache if no write invalidated the identity during the fetch
+            if identity and self._lookup_generations.get(unique_id) == 0:
+                self._identity_cache.set(unique_id, identity.model_copy(deep=True))
+            
+            # Waiters copy the shared result; this caller keeps the original
+            future.set_result(identity)
             return identity
         except Exception as e:
-            logger.error(f"Failed to get identity: {str(e)}")
+            logger.error("Failed to get identity: {}", e)
+            future.set_result(None)
             return None
+        finally:
+            self._pending_lookups.pop(unique_id, None)
+            self._lookup_generations.pop(unique_id, None)
+            if not future.done():
+                # Cancelled mid-fetch: release the waiters
+                future.cancel()
     
     async def update_identity_status(self, db, unique_id: str, 
                                     status: IdentityStatus) -> bool:
@@ -123,17 +184,19 @@ class IdentityService:
             True if updated successfully, False otherwise
         """
         try:
+            identity_repo = self._get_identity_repo(db)
             success = await identity_repo.update_status(unique_id, status)
+            self._invalidate_identity(unique_id)
             
             if success:
-                logger.info(f"Updated identity status: {unique_id} -> {status}")
+                logger.info("Updated identity status: {} -> {}", unique_id, status)
             else:
-                logger.warning(f"Failed to update identity status: {unique_id}")
+                logger.warning("Failed to update identity status: {}", unique_id)
             
             return success
             
         except Exception as e:
-            logger.error(f"Failed to update identity status: {str(e)}")
+            logger.error("Failed to update identity status: {}", e)
             return False
     
     async def update_identity_metadata(self, db, unique_id: str, 
@@ -149,17 +212,19 @@ class IdentityService:
             True if updated successfully, False otherwise
         """
         try:
+            identity_repo = self._get_identity_repo(db)
             success = await identity_repo.update_metadata(unique_id, metadata)
+            self._invalidate_identity(unique_id)
             
             if success:
-                logger.info(f"Updated identity metadata: {unique_id}")
+                logger.info("Updated identity metadata: {}", unique_id)
             else:
-                logger.warning(f"Failed to update identity metadata: {unique_id}")
+                logger.warning("Failed to update identity metadata: {}", unique_id)
             
             return success
             
         except Exception as e:
-            logger.error(f"Failed to update identity metadata: {str(e)}")
+            logger.error("Failed to update identity metadata: {}", e)
             return False
     
     async def add_application_to_identity(self, db, unique_id: str, 
@@ -175,53 +240,60 @@ class IdentityService:
             True if added successfully, False otherwise
         """
         try:
+            identity_repo = self._get_identity_repo(db)
             success = await identity_repo.add_application_id(unique_id, application_id)
+            self._invalidate_identity(unique_id)
             
             if success:
-                logger.info(f"Added application {application_id} to identity {unique_id}")
+                logger.info("Added application {} to identity {}", application_id, unique_id)
             else:
-                logger.warning(f"Failed to add application to identity: {unique_id}")
+                logger.warning("Failed to add application to identity: {}", unique_id)
             
             return success
             
         except Exception as e:
-            logger.error(f"Failed to add application to identity: {str(e)}")
+            logger.error("Failed to add application to identity: {}", e)
             return False
     
-    async def get_identity_applications(self, unique_id: str) -> List[str]:
+    async def get_identity_applications(self, db, unique_id: str) -> List[str]:
         """
         Get all application IDs associated with an identity
         
         Args:
+            db: Database connection
             unique_id: Identity unique identifier
             
         Returns:
             List of application IDs
         """
         try:
-            identity = await identity_repo.get_by_unique_id(unique_id)
+            cached = self._identity_cache.get(unique_id)
+            if cached is not None:
+                return list(cached.application_ids)
             
-            if identity:
-                return identity.application_ids
+            # Fetch only the application_ids array rather than the whole identity
+            identity_repo = self._get_identity_repo(db)
+            application_ids = await identity_repo.get_application_ids(unique_id)
             
-            return []
+            return application_ids or []
             
         except Exception as e:
-            logger.error(f"Failed to get identity applications: {str(e)}")
+            logger.error("Failed to get identity applications: {}", e)
             return []
     
-    async def validate_unique_id(self, unique_id: str) -> bool:
+    async def validate_unique_id(self, db, unique_id: str) -> bool:
         """
         Validate that a unique ID exists and is active
         
         Args:
+            db: Database connection
             unique_id: Identity unique identifier
             
         Returns:
             True if valid and active, False otherwise
         """
         try:
-            identity = await identity_repo.get_by_unique_id(unique_id)
+            identity = await self.get_identity(db, unique_id)
             
             if identity and identity.status == IdentityStatus.ACTIVE:
                 return True
@@ -229,7 +301,7 @@ class IdentityService:
             return False
             
         except Exception as e:
-            logger.error(f"Failed to validate unique ID: {str(e)}")
+            logger.error("Failed to validate unique ID: {}", e)
             return False
     
     async def get_statistics(self) -> Dict[str, Any]:
@@ -1,10 +1,14 @@
 """Simple metrics collection service for monitoring system performance"""
 
 import time
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict, deque
-from threading import Lock
+from array import array
+from itertools import count
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Sequence
+from datetime import datetime
+from collections import defaultdict
+from threading import Event, Lock, Thread, local
 from enum import Enum
 
 from app.core.logging import logger
@@ -21,37 +25,310 @@ class MetricType(str, Enum):
     ERROR = "error"
 
 
+# Shared read-only stats returned for metric types with no samples yet
+_ZERO_LATENCY_STATS: Mapping[str, Any] = MappingProxyType({
+    "count": 0,
+    "min_ms": 0,
+    "max_ms": 0,
+    "avg_ms": 0,
+    "p50_ms": 0,
+    "p95_ms": 0,
+    "p99_ms": 0
+})
+
+
+class ErrorRecord:
+    """Recorded error (fixed slots instead of a per-error dict)"""
+    
+    __slots__ = ("timestamp_ns", "metric_type", "error_message", "metadata")
+    
+    def __init__(self, timestamp_ns: int, metric_type: MetricType, error_message: str,
+                 metadata: Optional[Dict[str, Any]]):
+        self.timestamp_ns = timestamp_ns
+        self.metric_type = metric_type
+        self.error_message = error_message
+        self.metadata = metadata
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for API responses"""
+        return {
+            "timestamp": datetime.utcfromtimestamp(self.timestamp_ns * 1e-9).isoformat(),
+            "metric_type": self.metric_type,
+            "error_message": self.error_message,
+            "metadata": self.metadata or {}
+        }
+
+
+class PSquareEstimator:
+    """
+    Streaming quantile estimator (extended P-square algorithm, Jain & Chlamtac / Raatikainen)
+    
+    The first exact_limit samples are kept sorted and percentiles are
+    interpolated exactly over them. After that the markers are seeded from
+    the sorted samples, the samples are dropped, and the 2m+3 markers for m
+    target quantiles are updated in O(1) per sample. Estimates cover every
+    sample seen, not a recent window.
+    """
+    
+    def __init__(self, quantiles: Sequence[float] = (0.50, 0.95, 0.99), exact_limit: int = 1000):
+        """
+        Initialize estimator
+        
+        Args:
+            quantiles: Target quantiles in ascending order (each in (0, 1))
+            exact_limit: Number of samples kept for exact percentiles before
+                switching to streaming estimates
+        """
+        self.quantiles = tuple(quantiles)
+        
+        # Marker probabilities: min, midpoints and targets, max
+        dp = [0.0]
+        previous = 0.0
+        for q in self.quantiles:
+            dp.extend(((previous + q) / 2, q))
+            previous = q
+        dp.extend(((previous + 1.0) / 2, 1.0))
+        self.dp = dp
+        self.markers = len(dp)
+        self.exact_limit = max(exact_limit, self.markers)
+        
+        self.count = 0
+        self.total = 0.0
+        self.P: List[float] = []  # Sorted samples, then marker heights
+        self.N: List[int] = []  # Actual marker positions (1-based)
+        self.desired: List[float] = []  # Desired marker positions
+    
+    def update(self, value: float):
+        """Add a sample to the estimator"""
+        self.count += 1
+        self.total += value
+        P = self.P
+        m = self.markers
+        
+        # Exact phase: keep the samples sorted until there are exact_limit of them
+        if not self.N:
+            P.insert(bisect_right(P, value), value)
+            if self.count == self.exact_limit:
+                self._seed_markers()
+            return
+        
+        # Locate the cell containing the value, extending the extremes if needed
+        if value < P[0]:
+            P[0] = value
+            k = 0
+        elif value >= P[-1]:
+            P[-1] = value
+            k = m - 2
+        else:
+            k = bisect_right(P, value) - 1
+        
+        N = self.N
+        for i in range(k + 1, m):
+            N[i] += 1
+        desired = self.desired
+        for i, p in enumerate(self.dp):
+            desired[i] += p
+        
+        # Move interior markers that drifted more than one position
+        for i in range(1, m - 1):
+            d = desired[i] - N[i]
+            if (d >= 1 and N[i + 1] - N[i] > 1) or (d <= -1 and N[i - 1] - N[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not P[i - 1] < height < P[i + 1]:
+                    height = P[i] + step * (P[i + step] - P[i]) / (N[i + step] - N[i])
+                P[i] = height
+                N[i] += step
+    
+    def _seed_markers(self):
+        """Place the markers on the sorted samples and drop the rest"""
+        samples = self.P
+        n, m = len(samples), self.markers
+        self.desired = [1 + (n - 1) * p for p in self.dp]
+        
+        # Nearest sample to each desired position, keeping positions strictly increasing
+        N = []
+        for i, d in enumerate(self.desired):
+            position = max(round(d), N[-1] + 1 if N else 1)
+            N.append(min(position, n - (m - 1 - i)))
+        self.N = N
+        self.P = [samples[i - 1] for i in N]
+    
+    def _parabolic(self, i: int, step: int) -> float:
+        """Piecewise-parabolic prediction of marker i moved by step"""
+        P, N = self.P, self.N
+        return P[i] + step / (N[i + 1] - N[i - 1]) * (
+            (N[i] - N[i - 1] + step) * (P[i + 1] - P[i]) / (N[i + 1] - N[i])
+            + (N[i + 1] - N[i] - step) * (P[i] - P[i - 1]) / (N[i] - N[i - 1])
+        )
+    
+    def quantile(self, q: float) -> float:
+        """
+        Get the current estimate for one of the target quantiles
+        
+        Args:
+            q: Quantile (must be one of the configured quantiles)
+            
+        Returns:
+            Estimated value (exact until exact_limit samples have been seen)
+        """
+        if not self.P:
+            return 0
+        
+        if not self.N:
+            # Exact phase: interpolate over the sorted samples directly
+            k = (len(self.P) - 1) * q
+            f = int(k)
+            if f + 1 >= len(self.P):
+                return self.P[-1]
+            return self.P[f] + (k - f) * (self.P[f + 1] - self.P[f])
+        
+        return self.P[2 * (self.quantiles.index(q) + 1)]
+    
+    @property
+    def minimum(self) -> float:
+        return self.P[0] if self.P else 0
+    
+    @property
+    def maximum(self) -> float:
+        return self.P[-1] if self.P else 0
+
+
+class _MetricStripe:
+    """Lock plus counters, latency estimators and rate buckets for one stripe"""
+    
+    __slots__ = ("lock", "window", "counters", "latencies", "bucket_counts", "bucket_epochs")
+    
+    def __init__(self, window: int, exact_limit: int):
+        self.lock = Lock()
+        self.window = window
+        
+        # Counters for the metric types hashed to this stripe
+        self.counters: Dict[str, int] = defaultdict(int)
+        
+        # Latency tracking (exact, then streaming, percentile estimator per metric type)
+        self.latencies: Dict[str, PSquareEstimator] = defaultdict(
+            lambda: PSquareEstimator(exact_limit=exact_limit)
+        )
+        
+        # Processing rate tracking: ring of per-second event counts per metric type,
+        # each bucket tagged with the monotonic second it was last written in
+        self.bucket_counts: Dict[str, array] = defaultdict(lambda: array("Q", [0]) * window)
+        self.bucket_epochs: Dict[str, array] = defaultdict(lambda: array("q", [-1]) * window)
+    
+    def record_event(self, metric_type: MetricType, timestamp_ns: Optional[int] = None):
+        """Count one event in its second's bucket (caller holds the lock)"""
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        second = timestamp_ns // 1_000_000_000
+        index = second % self.window
+        epochs = self.bucket_epochs[metric_type]
+        counts = self.bucket_counts[metric_type]
+        
+        # Bucket still holds a count from a previous lap of the ring
+        if epochs[index] != second:
+            epochs[index] = second
+            counts[index] = 0
+        counts[index] += 1
+    
+    def count_events(self, metric_type: MetricType, window_seconds: int) -> int:
+        """Sum event buckets over the last window_seconds (caller holds the lock)"""
+        if metric_type not in self.bucket_counts:
+            return 0
+        
+        epochs = self.bucket_epochs[metric_type]
+        counts = self.bucket_counts[metric_type]
+        now = time.monotonic_ns() // 1_000_000_000
+        window = min(window_seconds, self.window)
+        
+        total = 0
+        for second in range(now - window + 1, now + 1):
+            index = second % self.window
+            if epochs[index] == second:
+                total += counts[index]
+        return total
+    
+    def clear(self):
+        """Drop all state (caller holds the lock)"""
+        self.counters.clear()
+        self.latencies.clear()
+        self.bucket_counts.clear()
+        self.bucket_epochs.clear()
+
+
 class MetricsService:
     """Service for collecting and tracking system metrics"""
     
+    # Longest window (seconds) supported by the per-second rate buckets
+    RATE_WINDOW_SECONDS = 120
+    
+    # Number of lock stripes (power of two so a stripe is picked with a mask)
+    STRIPES = 16
+    
+    # How long (seconds) a get_all_metrics summary may be reused
+    SUMMARY_TTL = 0.5
+    
+    # How often (seconds) the background flusher merges buffered latency samples
+    FLUSH_INTERVAL = 0.1
+    
+    # Number of recent error details kept (power of two so slots wrap with a mask)
+    ERROR_RING_SIZE = 128
+    
     def __init__(self, max_history: int = 1000):
         """
         Initialize metrics service
         
         Args:
-            max_history: Maximum number of metric entries to keep in memory
+            max_history: Latency samples kept per metric type for exact
+                percentiles; beyond that percentiles are streaming estimates
+        
+        Counters, latency stats and error totals cover the process lifetime
+        (or the time since reset_metrics); only the processing and error
+        rates are windowed.
         """
         self.max_history = max_history
-        self.lock = Lock()
         
-        # Counters for different metric types
-        self.counters: Dict[str, int] = defaultdict(int)
-        
-        # Latency tracking (deque for efficient append/pop)
-        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_history))
+        # Per-metric state is sharded across stripes so writers of different
+        # metric types never contend on the same lock
+        self._stripes = [_MetricStripe(self.RATE_WINDOW_SECONDS, max_history) for _ in range(self.STRIPES)]
+        self._stripe_mask = self.STRIPES - 1
         
         # Error tracking
+        self.error_lock = Lock()
         self.errors: Dict[str, int] = defaultdict(int)
-        self.error_details: deque = deque(maxlen=100)
+        self._error_keys: Dict[MetricType, str] = {mt: f"{mt.value}_error" for mt in MetricType}
+        self.total_errors = 0
+        
+        # Recent error details: fixed ring written at next(ticket) & mask. The
+        # slot write and head advance happen under error_lock, so the head
+        # never runs ahead of (or falls behind) the slots actually written
+        self._error_ring: List[Optional[ErrorRecord]] = [None] * self.ERROR_RING_SIZE
+        self._error_mask = self.ERROR_RING_SIZE - 1
+        self._error_tickets = count()
+        self._error_head = 0
         
-        # Processing rate tracking (timestamp, metric_type)
-        self.events: deque = deque(maxlen=max_history)
+        # Latency samples are appended to per-thread buffers without locking and
+        # merged into the stripes by a background flusher (or before any read)
+        self._local = local()
+        self._buffers: List[list] = []
+        self._buffers_lock = Lock()
+        self._flush_lock = Lock()
+        self._flusher: Optional[Thread] = None
+        self._flusher_stop = Event()
         
-        # Start time for uptime calculation
-        self.start_time = datetime.utcnow()
+        # Last get_all_metrics result and when it was built (monotonic seconds)
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        self._summary_cache_ts = 0.0
+        
+        # Start time for uptime calculation (monotonic, integer nanoseconds)
+        self.start_time_ns = time.monotonic_ns()
         
         logger.info("Metrics service initialized")
     
+    def _stripe(self, metric_type: MetricType) -> _MetricStripe:
+        """Get the stripe owning a metric type"""
+        return self._stripes[hash(metric_type) & self._stripe_mask]
+    
     def record_count(self, metric_type: MetricType, count: int = 1):
         """
         Record a counter metric
@@ -60,9 +337,10 @@ class MetricsService:
             metric_type: Type of metric
             count: Count to add (default 1)
         """
-        with self.lock:
-            self.counters[metric_type] += count
-            self.events.append((datetime.utcnow(), metric_type))
+        stripe = self._stripe(metric_type)
+        with stripe.lock:
+            stripe.counters[metric_type] += count
+            stripe.record_event(metric_type)
     
     def record_latency(self, metric_type: MetricType, latency_ms: float, metadata: Optional[Dict[str, Any]] = None):
         """
@@ -73,14 +351,57 @@ class MetricsService:
             latency_ms: Latency in milliseconds
             metadata: Optional metadata about the operation
         """
-        with self.lock:
-            self.latencies[metric_type].append({
-                "timestamp": datetime.utcnow(),
-                "latency_ms": latency_ms,
-                "metadata": metadata or {}
-            })
-            self.counters[metric_type] += 1
-            self.events.append((datetime.utcnow(), metric_type))
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._register_buffer()
+        buffer.append((metric_type, latency_ms, time.monotonic_ns()))
+    
+    def _register_buffer(self) -> list:
+        """Create the calling thread's latency buffer and start the flusher if needed"""
+        buffer = []
+        self._local.buffer = buffer
+        
+        with self._buffers_lock:
+            self._buffers.append(buffer)
+            if self._flusher is None:
+                self._flusher = Thread(target=self._flush_loop, name="metrics-flusher", daemon=True)
+                self._flusher.start()
+        
+        return buffer
+    
+    def _flush_loop(self):
+        """Background thread body: merge buffered samples every FLUSH_INTERVAL"""
+        while not self._flusher_stop.wait(self.FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Metrics flush failed: {str(e)}")
+    
+    def flush(self):
+        """Merge all buffered latency samples into the per-stripe estimators"""
+        with self._flush_lock:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+            
+            # Take what is there now; appends racing with this land after
+            # the deleted prefix and are picked up on the next flush
+            by_stripe: Dict[int, list] = defaultdict(list)
+            for buffer in buffers:
+                taken = len(buffer)
+                if not taken:
+                    continue
+                for sample in buffer[:taken]:
+                    by_stripe[hash(sample[0]) & self._stripe_mask].append(sample)
+                del buffer[:taken]
+            
+            # One lock acquisition per stripe for the whole batch
+            for index, samples in by_stripe.items():
+                stripe = self._stripes[index]
+                with stripe.lock:
+                    for metric_type, latency_ms, timestamp_ns in samples:
+                        stripe.latencies[metric_type].update(latency_ms)
+                        stripe.counters[metric_type] += 1
+                        stripe.record_event(metric_type, timestamp_ns)
     
     def record_error(self, metric_type: MetricType, error_message: str, metadata: Optional[Dict[str, Any]] = None):
         """
@@ -91,93 +412,90 @@ class MetricsService:
             error_message: Error message
             metadata: Optional metadata about the error
         """
-        with self.lock:
-            error_key = f"{metric_type}_error"
+        record = ErrorRecord(time.time_ns(), metric_type, error_message, metadata)
+        error_key = self._error_keys.get(metric_type) or f"{metric_type}_error"
+        
+        with self.error_lock:
             self.errors[error_key] += 1
-            self.error_details.append({
-                "timestamp": datetime.utcnow(),
-                "metric_type": metric_type,
-                "error_message": error_message,
-                "metadata": metadata or {}
-            })
-            self.events.append((datetime.utcnow(), MetricType.ERROR))
+            self.total_errors += 1
+            
+            ticket = next(self._error_tickets)
+            self._error_ring[ticket & self._error_mask] = record
+            self._error_head = ticket + 1
+        
+        stripe = self._stripe(MetricType.ERROR)
+        with stripe.lock:
+            stripe.record_event(MetricType.ERROR)
     
     def get_counter(self, metric_type: MetricType) -> int:
         """Get current counter value"""
-        with self.lock:
-            return self.counters.get(metric_type, 0)
+        self.flush()
+        stripe = self._stripe(metric_type)
+        with stripe.lock:
+            return stripe.counters.get(metric_type, 0)
     
-    def get_latency_stats(self, metric_type: MetricType) -> Dict[str, Any]:
+    def get_latency_stats(self, metric_type: MetricType) -> Mapping[str, Any]:
         """
         Get latency statistics for a metric type
         
         Returns:
-            Dictionary with min, max, avg, p50, p95, p99 latencies
+            Mapping with min, max, avg, p50, p95, p99 latencies (read-only
+            shared mapping when there are no samples)
         """
-        with self.lock:
-            latencies = self.latencies.get(metric_type, deque())
+        self.flush()
+        stripe = self._stripe(metric_type)
+        with stripe.lock:
+            estimator = stripe.latencies.get(metric_type)
             
-            if not latencies:
-                return {
-                    "count": 0,
-                    "min_ms": 0,
-                    "max_ms": 0,
-                    "avg_ms": 0,
-                    "p50_ms": 0,
-                    "p95_ms": 0,
-                    "p99_ms": 0
-                }
-            
-            # Extract latency values
-            values = sorted([entry["latency_ms"] for entry in latencies])
-            count = len(values)
-            
-            # Calculate percentiles
-            def percentile(data: List[float], p: float) -> float:
-                if not data:
-                    return 0
-                k = (len(data) - 1) * p
-                f = int(k)
-                c = f + 1
-                if c >= len(data):
-                    return data[-1]
-                return data[f] + (k - f) * (data[c] - data[f])
+            if estimator is None or not estimator.count:
+                return _ZERO_LATENCY_STATS
             
+            # Read the estimator markers directly - no copy, no sort
             return {
-                "count": count,
-                "min_ms": min(values),
-                "max_ms": max(values),
-                "avg_ms": sum(values) / count,
-                "p50_ms": percentile(values, 0.50),
-                "p95_ms": percentile(values, 0.95),
-                "p99_ms": percentile(values, 0.99)
+                "count": estimator.count,
+                "min_ms": estimator.minimum,
+                "max_ms": estimator.maximum,
+                "avg_ms": estimator.total / estimator.count,
+                "p50_ms": estimator.quantile(0.50),
+                "p95_ms": estimator.quantile(0.95),
+                "p99_ms": estimator.quantile(0.99)
             }
     
+    def _count_all_events(self, window_seconds: int) -> int:
+        """Sum recent events of every metric type across all stripes"""
+        self.flush()
+        total = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                total += sum(stripe.count_events(mt, window_seconds) for mt in stripe.bucket_counts)
+        return total
+    
     def get_processing_rate(self, metric_type: Optional[MetricType] = None, window_seconds: int = 60) -> float:
         """
         Get processing rate (events per second)
         
         Args:
             metric_type: Optional metric type to filter by
-            window_seconds: Time window in seconds (default 60)
+            window_seconds: Time window in seconds (default 60; longer windows
+                are capped at RATE_WINDOW_SECONDS)
             
         Returns:
             Events per second
         """
-        with self.lock:
-            cutoff_time = datetime.utcnow() - timedelta(seconds=window_seconds)
-            
-            # Filter events by time window and optionally by type
-            recent_events = [
-                event for event in self.events
-                if event[0] >= cutoff_time and (metric_type is None or event[1] == metric_type)
-            ]
-            
-            if not recent_events:
-                return 0.0
-            
-            # Calculate rate
-            return len(recent_events) / window_seconds
+        # The rate buckets only cover RATE_WINDOW_SECONDS, so the rate is
+        # taken over the window that was actually counted
+        window_seconds = min(window_seconds, self.RATE_WINDOW_SECONDS)
+        
+        if metric_type is None:
+            recent_events = self._count_all_events(window_seconds)
+        else:
+            self.flush()
+            stripe = self._stripe(metric_type)
+            with stripe.lock:
+                recent_events = stripe.count_events(metric_type, window_seconds)
+        
+        # Calculate rate
+        return recent_events / window_seconds
     
     def get_error_rate(self, window_seconds: int = 60) -> float:
         """
@@ -189,17 +507,17 @@ class MetricsService:
         Returns:
             Error rate as percentage (0-100)
         """
-        with self.lock:
-            cutoff_time = datetime.utcnow() - timedelta(seconds=window_seconds)
-            
-            # Count recent events and errors
-            recent_events = [event for event in self.events if event[0] >= cutoff_time]
-            recent_errors = [event for event in recent_events if event[1] == MetricType.ERROR]
-            
-            if not recent_events:
-                return 0.0
-            
-            return (len(recent_errors) / len(recent_events)) * 100
+        # Count recent events and errors
+        recent_events = self._count_all_events(window_seconds)
+        
+        if not recent_events:
+            return 0.0
+        
+        stripe = self._stripe(MetricType.ERROR)
+        with stripe.lock:
+            recent_errors = stripe.count_events(MetricType.ERROR, window_seconds)
+        
+        return (recent_errors / recent_events) * 100
     
     def get_recent_errors(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -211,66 +529,88 @@ class MetricsService:
         Returns:
             List of error details
         """
-        with self.lock:
-            errors = list(self.error_details)[-limit:]
-            return [
-                {
-                    "timestamp": error["timestamp"].isoformat(),
-                    "metric_type": error["metric_type"],
-                    "error_message": error["error_message"],
-                    "metadata": error["metadata"]
-                }
-                for error in errors
-            ]
+        with self.error_lock:
+            head = self._error_head
+            n = min(limit, self.ERROR_RING_SIZE, head)
+            ring, mask = self._error_ring, self._error_mask
+            errors = [ring[(head - n + i) & mask] for i in range(n)]
+        return [error.to_dict() for error in errors if error is not None]
     
     def get_uptime_seconds(self) -> float:
         """Get system uptime in seconds"""
-        return (datetime.utcnow() - self.start_time).total_seconds()
+        return (time.monotonic_ns() - self.start_time_ns) * 1e-9
     
     def get_all_metrics(self) -> Dict[str, Any]:
         """
         Get all metrics summary
         
         Returns:
-            Dictionary with all metrics
+            Dictionary with all metrics (may be up to SUMMARY_TTL seconds old)
         """
-        with self.lock:
-            # Get latency stats for each metric type
-            latency_stats = {}
-            for metric_type in MetricType:
-                if metric_type != MetricType.ERROR:
-                    stats = self.get_latency_stats(metric_type)
-                    if stats["count"] > 0:
-                        latency_stats[metric_type] = stats
+        now = time.monotonic()
+        cached = self._summary_cache
+        if cached is not None and now - self._summary_cache_ts < self.SUMMARY_TTL:
+            return cached
+        
+        # Each getter takes only the stripe lock it needs; no lock is held
+        # across the whole summary
+        latency_stats = {}
+        processing_rates = {}
+        for metric_type in MetricType:
+            if metric_type == MetricType.ERROR:
+                continue
             
-            # Get processing rates
-            processing_rates = {}
-            for metric_type in MetricType:
-                if metric_type != MetricType.ERROR:
-                    rate = self.get_processing_rate(metric_type, window_seconds=60)
-                    if rate > 0:
-                        processing_rates[metric_type] = round(rate, 2)
+            stats = self.get_latency_stats(metric_type)
+            if stats["count"] > 0:
+                latency_stats[metric_type] = stats
             
-            return {
-                "uptime_seconds": round(self.get_uptime_seconds(), 2),
-                "counters": dict(self.counters),
-                "latency_stats": latency_stats,
-                "processing_rates": processing_rates,
-                "error_rate_percent": round(self.get_error_rate(), 2),
-                "total_errors": sum(self.errors.values()),
-                "recent_errors": self.get_recent_errors(5)
-            }
+            rate = self.get_processing_rate(metric_type, window_seconds=60)
+            if rate > 0:
+                processing_rates[metric_type] = round(rate, 2)
+        
+        # Merge counters from every stripe
+        self.flush()
+        counters: Dict[str, int] = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                counters.update(stripe.counters)
+        
+        summary = {
+            "uptime_seconds": round(self.get_uptime_seconds(), 2),
+            "counters": counters,
+            "latency_stats": latency_stats,
+            "processing_rates": processing_rates,
+            "error_rate_percent": round(self.get_error_rate(), 2),
+            "total_errors": self.total_errors,
+            "recent_errors": self.get_recent_errors(5)
+        }
+        
+        # Single reference swaps, so concurrent readers see either summary
+        self._summary_cache = summary
+        self._summary_cache_ts = now
+        return summary
     
     def reset_metrics(self):
         """Reset all metrics (useful for testing)"""
-        with self.lock:
-            self.counters.clear()
-            self.latencies.clear()
+        with self._flush_lock:
+            with self._buffers_lock:
+                for buffer in self._buffers:
+                    buffer.clear()
+        
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.clear()
+        
+        with self.error_lock:
             self.errors.clear()
-            self.error_details.clear()
-            self.events.clear()
-            self.start_time = datetime.utcnow()
-            logger.info("Metrics reset")
+            self.total_errors = 0
+            self._error_ring = [None] * self.ERROR_RING_SIZE
+            self._error_tickets = count()
+            self._error_head = 0
+        
+        self.start_time_ns = time.monotonic_ns()
+        self._summary_cache = None
+        logger.info("Metrics reset")
     
     def log_metrics_summary(self):
         """Log current metrics summary to console"""
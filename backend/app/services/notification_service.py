@@ -20,6 +20,7 @@ class NotificationEvent(str, Enum):
     APPLICATION_PENDING_REVIEW = "application.pending_review"
     IDENTITY_CREATED = "identity.created"
     DUPLICATE_DETECTED = "duplicate.detected"
+    BULK_REVIEW_COMPLETED = "review.bulk_completed"
 
 
 class NotificationService:
@@ -29,8 +30,31 @@ class NotificationService:
         self.webhook_timeout = 10  # seconds
         self.max_retries = 3
         self.retry_delay = 2  # seconds
+        
+        # Shared client so repeated webhooks reuse keep-alive connections
+        self._client: Optional[httpx.AsyncClient] = None
+        
         logger.info("Notification service initialized")
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.webhook_timeout,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30
+                )
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def send_webhook(
         self,
         webhook_url: str,
@@ -66,24 +90,23 @@ class NotificationService:
         
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.webhook_timeout) as client:
-                    response = await client.post(
-                        webhook_url,
-                        json=payload,
-                        headers=default_headers
+                response = await self._get_client().post(
+                    webhook_url,
+                    json=payload,
+                    headers=default_headers
+                )
+                
+                if response.status_code in [200, 201, 202, 204]:
+                    logger.info(
+                        f"Webhook sent successfully: {event.value} to {webhook_url} "
+                        f"(status: {response.status_code})"
+                    )
+                    return True
+                else:
+                    logger.warning(
+                        f"Webhook returned non-success status: {response.status_code} "
+                        f"for {event.value} to {webhook_url}"
                     )
-                    
-                    if response.status_code in [200, 201, 202, 204]:
-                        logger.info(
-                            f"Webhook sent successfully: {event.value} to {webhook_url} "
-                            f"(status: {response.status_code})"
-                        )
-                        return True
-                    else:
-                        logger.warning(
-                            f"Webhook returned non-success status: {response.status_code} "
-                            f"for {event.value} to {webhook_url}"
-                        )
                         
             except httpx.TimeoutException:
                 logger.warning(
@@ -220,6 +243,40 @@ class NotificationService:
             data
         )
     
+    async def notify_bulk_review(
+        self,
+        applications: List[Dict[str, Any]],
+        decision: str,
+        reviewed_by: str,
+        webhook_url: Optional[str] = None
+    ) -> bool:
+        """
+        Send one notification covering a whole bulk review decision
+        
+        Args:
+            applications: Reviewed applications (application_id and new status)
+            decision: Review decision applied
+            reviewed_by: Reviewer user ID
+            webhook_url: Optional webhook URL
+            
+        Returns:
+            True if notification sent successfully
+        """
+        if not webhook_url or not applications:
+            return False
+        
+        data = {
+            "applications": applications,
+            "decision": decision,
+            "reviewed_by": reviewed_by
+        }
+        
+        return await self.send_webhook(
+            webhook_url,
+            NotificationEvent.BULK_REVIEW_COMPLETED,
+            data
+        )
+    
     async def send_batch_notifications(
         self,
         notifications: List[Dict[str, Any]]
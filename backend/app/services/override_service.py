@@ -1,14 +1,16 @@
 """Override service for manual review decisions"""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 from enum import Enum
 
 from app.core.logging import logger
+from app.database.mongodb import get_database
 from app.database.repositories import ApplicationRepository, IdentityRepository
 from app.models.application import ApplicationStatus
 from app.models.identity import IdentityStatus
 from app.services.audit_service import audit_service
+from app.services.identity_service import identity_service
 from app.services.notification_service import notification_service
 
 
@@ -54,6 +56,84 @@ class OverrideService:
         """
         return len(justification.strip()) >= self.min_justification_length
     
+    def _validate_request(self, decision: str, justification: str) -> None:
+        """
+        Validate decision and justification
+        
+        Raises:
+            ValueError: If either is invalid
+        """
+        if not self.validate_decision(decision):
+            raise ValueError(f"Invalid decision: {decision}")
+        
+        if not self.validate_justification(justification):
+            raise ValueError(f"Justification must be at least {self.min_justification_length} characters")
+    
+    def _plan_override(self, application, decision: str, justification: str,
+                       admin_id: str, reviewed_at: datetime) -> Tuple[ApplicationStatus, Dict[str, Any], bool]:
+        """
+        Work out the new status and result fields for an override decision
+        
+        Args:
+            application: Application being overridden
+            decision: Override decision
+            justification: Justification for decision
+            admin_id: Admin user ID
+            reviewed_at: Timestamp recorded for the review
+            
+        Returns:
+            Tuple of (new_status, result_updates, needs_identity); the caller
+            creates the identity when needs_identity is set
+        """
+        application_id = application.application_id
+        new_status = application.processing.status
+        needs_identity = False
+        result_updates = {
+            "reviewed_by": admin_id,
+            "review_notes": justification,
+            "reviewed_at": reviewed_at
+        }
+        
+        if decision == OverrideDecision.APPROVE_DUPLICATE:
+            # Confirm as duplicate
+            new_status = ApplicationStatus.DUPLICATE
+            result_updates["is_duplicate"] = True
+            result_updates["final_status"] = ApplicationStatus.DUPLICATE
+            
+            logger.info(f"Override: Approved duplicate for {application_id}")
+            
+        elif decision == OverrideDecision.REJECT_DUPLICATE:
+            # Reject duplicate classification - mark as verified
+            new_status = ApplicationStatus.VERIFIED
+            result_updates["is_duplicate"] = False
+            result_updates["final_status"] = ApplicationStatus.VERIFIED
+            
+            # If was previously duplicate, it needs a new identity of its own
+            needs_identity = bool(application.result.is_duplicate)
+            
+            logger.info(f"Override: Rejected duplicate for {application_id}")
+            
+        elif decision == OverrideDecision.FLAG_FOR_REVIEW:
+            # Flag for further review - keep current status
+            result_updates["requires_manual_review"] = True
+            
+            logger.info(f"Override: Flagged for review {application_id}")
+        
+        return new_status, result_updates, needs_identity
+    
+    async def _create_override_identity(self, db, application_id: str,
+                                        justification: str, admin_id: str) -> str:
+        """Create the identity for an application whose duplicate flag was rejected"""
+        new_identity = await identity_service.create_identity(
+            db=db,
+            application_id=application_id,
+            metadata={"override_reason": justification, "overridden_by": admin_id}
+        )
+        
+        logger.info(f"Override: Created new identity {new_identity.unique_id} for {application_id}")
+        
+        return new_identity.unique_id
+    
     async def apply_override(self, application_id: str, decision: str,
                            justification: str, admin_id: str, db=None) -> Dict[str, Any]:
         """
@@ -73,15 +153,10 @@ class OverrideService:
         """
         try:
             # Validate inputs
-            if not self.validate_decision(decision):
-                raise ValueError(f"Invalid decision: {decision}")
-            
-            if not self.validate_justification(justification):
-                raise ValueError(f"Justification must be at least {self.min_justification_length} characters")
+            self._validate_request(decision, justification)
             
             # Get database connection if not provided
             if db is None:
-                from app.database.mongodb import get_database
                 db = await get_database()
             
             # Get application
@@ -93,55 +168,25 @@ class OverrideService:
             
             # Store original status
             original_status = application.processing.status
-            original_is_duplicate = application.result.is_duplicate
             
-            # Apply decision
-            new_status = original_status
-            result_updates = {
-                "reviewed_by": admin_id,
-                "review_notes": justification,
-                "reviewed_at": datetime.utcnow()
-            }
+            # Single timestamp for the whole decision (stored and reported)
+            reviewed_at = datetime.utcnow()
             
-            if decision == OverrideDecision.APPROVE_DUPLICATE:
-                # Confirm as duplicate
-                new_status = ApplicationStatus.DUPLICATE
-                result_updates["is_duplicate"] = True
-                result_updates["final_status"] = ApplicationStatus.DUPLICATE
-                
-                logger.info(f"Override: Approved duplicate for {application_id}")
-                
-            elif decision == OverrideDecision.REJECT_DUPLICATE:
-                # Reject duplicate classification - mark as verified
-                new_status = ApplicationStatus.VERIFIED
-                result_updates["is_duplicate"] = False
-                result_updates["final_status"] = ApplicationStatus.VERIFIED
-                
-                # If was previously duplicate, may need to create new identity
-                if original_is_duplicate:
-                    from app.services.identity_service import identity_service
-                    
-                    # Create new identity for this application
-                    new_identity = await identity_service.create_identity(
-                        application_id=application_id,
-                        metadata={"override_reason": justification, "overridden_by": admin_id}
-                    )
-                    
-                    result_updates["identity_id"] = new_identity.unique_id
-                    
-                    logger.info(f"Override: Created new identity {new_identity.unique_id} for {application_id}")
-                
-                logger.info(f"Override: Rejected duplicate for {application_id}")
-                
-            elif decision == OverrideDecision.FLAG_FOR_REVIEW:
-                # Flag for further review - keep current status
-                result_updates["requires_manual_review"] = True
-                
-                logger.info(f"Override: Flagged for review {application_id}")
+            # Apply decision
+            new_status, result_updates, needs_identity = self._plan_override(
+                application, decision, justification, admin_id, reviewed_at
+            )
+            if needs_identity:
+                result_updates["identity_id"] = await self._create_override_identity(
+                    db, application_id, justification, admin_id
+                )
             
-            # Update application
-            await app_repo.update_status(application_id, new_status)
-            await app_repo.update_result(application_id, result_updates)
+            # Update application status and result in one write
+            await app_repo.update_application_atomic(
+                application_id,
+                status=new_status,
+                result_data=result_updates
+            )
             
             # Log override decision to audit trail
             if db:
@@ -158,17 +203,10 @@ class OverrideService:
             # Send notification if webhook configured
             # (webhook URL would need to be retrieved from application or config)
             
-            # Build result
-            result = {
-                "application_id": application_id,
-                "decision": decision,
-                "original_status": original_status,
-                "new_status": new_status,
-                "admin_id": admin_id,
-                "justification": justification,
-                "timestamp": datetime.utcnow().isoformat(),
-                "success": True
-            }
+            result = self._build_result(
+                application_id, decision, original_status, new_status,
+                admin_id, justification, reviewed_at
+            )
             
             logger.info(f"Override applied successfully: {application_id} - {decision}")
             
@@ -178,6 +216,125 @@ class OverrideService:
             logger.error(f"Failed to apply override: {str(e)}")
             raise ValueError(f"Override failed: {str(e)}")
     
+    async def apply_override_bulk(self, decisions: List[Dict[str, Any]],
+                                  db=None) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Apply several override decisions with set-oriented writes
+        
+        Applications are fetched with one $in query, updated with one
+        bulk_write and audited with one insert_many. At most one decision
+        per application is applied; later decisions for the same
+        application in the batch fail. Identities for rejected duplicates
+        are only created once the bulk write has succeeded.
+        
+        Args:
+            decisions: Dicts with application_id, decision, justification and admin_id
+            db: Database connection
+            
+        Returns:
+            One entry per decision, in order: the result dictionary, or the
+            ValueError explaining why that decision failed
+        """
+        if db is None:
+            db = await get_database()
+        
+        app_repo = ApplicationRepository(db)
+        outcomes: List[Union[Dict[str, Any], Exception]] = [None] * len(decisions)
+        
+        applications = await app_repo.get_many_by_ids(
+            list(dict.fromkeys(d["application_id"] for d in decisions))
+        )
+        reviewed_at = datetime.utcnow()
+        
+        updates = []
+        planned = []
+        needing_identity = []
+        planned_ids = set()
+        for index, item in enumerate(decisions):
+            application_id = item["application_id"]
+            try:
+                self._validate_request(item["decision"], item["justification"])
+                
+                application = applications.get(application_id)
+                if not application:
+                    raise ValueError(f"Application {application_id} not found")
+                
+                if application_id in planned_ids:
+                    raise ValueError(
+                        f"Application {application_id} already has a decision in this batch"
+                    )
+                
+                new_status, result_updates, needs_identity = self._plan_override(
+                    application, item["decision"], item["justification"],
+                    item["admin_id"], reviewed_at
+                )
+                planned_ids.add(application_id)
+                updates.append((application_id, new_status, result_updates))
+                planned.append((index, item, application.processing.status, new_status))
+                if needs_identity:
+                    needing_identity.append((index, item))
+                
+            except Exception as e:
+                logger.error(f"Failed to apply override: {str(e)}")
+                outcomes[index] = ValueError(f"Override failed: {str(e)}")
+        
+        if updates:
+            await app_repo.update_applications_bulk(updates)
+            
+            await audit_service.log_many(db, [
+                audit_service.build_override_log(
+                    application_id=item["application_id"],
+                    admin_id=item["admin_id"],
+                    decision=item["decision"],
+                    justification=item["justification"],
+                    original_status=original_status.value,
+                    new_status=new_status.value
+                )
+                for _, item, original_status, new_status in planned
+            ])
+        
+        # The overrides are stored; now issue identities and link them
+        identity_links = []
+        for index, item in needing_identity:
+            try:
+                identity_id = await self._create_override_identity(
+                    db, item["application_id"], item["justification"], item["admin_id"]
+                )
+                identity_links.append((item["application_id"], None, {"identity_id": identity_id}))
+            except Exception as e:
+                logger.error(f"Failed to create identity for override: {str(e)}")
+                outcomes[index] = ValueError(f"Override failed: {str(e)}")
+        
+        if identity_links:
+            await app_repo.update_applications_bulk(identity_links)
+        
+        for index, item, original_status, new_status in planned:
+            if outcomes[index] is None:
+                outcomes[index] = self._build_result(
+                    item["application_id"], item["decision"], original_status, new_status,
+                    item["admin_id"], item["justification"], reviewed_at
+                )
+        
+        successful = sum(1 for outcome in outcomes if not isinstance(outcome, Exception))
+        logger.info(f"Bulk override applied: {successful}/{len(decisions)} successful")
+        
+        return outcomes
+    
+    def _build_result(self, application_id: str, decision: str, original_status: ApplicationStatus,
+                      new_status: ApplicationStatus, admin_id: str, justification: str,
+                      reviewed_at: datetime) -> Dict[str, Any]:
+        """Build the result dictionary reported for an applied override"""
+        return {
+            "application_id": application_id,
+            "decision": decision,
+            "original_status": original_status,
+            "new_status": new_status,
+            "admin_id": admin_id,
+            "justification": justification,
+            "timestamp": reviewed_at.isoformat(),
+            "success": True
+        }
+    
     async def get_override_history(self, application_id: str) -> list[Dict[str, Any]]:
         """
         Get override history for an application
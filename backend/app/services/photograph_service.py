@@ -1,7 +1,10 @@
 """Photograph validation and storage service"""
 
-import base64
+import asyncio
+import binascii
 import os
+import struct
+import time
 from pathlib import Path
 from typing import Tuple, Optional
 from PIL import Image
@@ -9,7 +12,6 @@ import io
 
 from app.core.config import settings
 from app.core.logging import logger
-from app.core.security import security_manager
 
 
 class PhotographValidationError(Exception):
@@ -20,6 +22,54 @@ class PhotographValidationError(Exception):
         super().__init__(message)
 
 
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# JPEG start-of-frame markers (0xC4, 0xC8 and 0xCC are DHT/JPG/DAC, not frames)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def read_image_dimensions(image_data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read width and height from PNG/JPEG headers without decoding the image
+    
+    Args:
+        image_data: Raw image bytes
+        
+    Returns:
+        Tuple of (width, height), or None if the format is not recognised
+    """
+    if image_data[:8] == _PNG_SIGNATURE and len(image_data) >= 24:
+        # IHDR is always the first chunk: width and height at offsets 16/20
+        width, height = struct.unpack(">II", image_data[16:24])
+        return width, height
+    
+    if image_data[:2] != b"\xff\xd8":
+        return None
+    
+    # Walk JPEG segments until the first start-of-frame marker
+    offset = 2
+    length = len(image_data)
+    while offset + 9 <= length:
+        if image_data[offset] != 0xFF:
+            return None
+        marker = image_data[offset + 1]
+        if marker == 0xFF:
+            # Fill byte
+            offset += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", image_data[offset + 5:offset + 9])
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # Standalone markers carry no length
+            offset += 2
+            continue
+        segment_length = struct.unpack(">H", image_data[offset + 2:offset + 4])[0]
+        offset += 2 + segment_length
+    
+    return None
+
+
 class PhotographService:
     """Service for photograph validation and storage"""
     
@@ -29,9 +79,19 @@ class PhotographService:
         self.supported_formats = ["jpg", "jpeg", "png", "mpo", "bmp", "gif", "tiff", "webp"]
         self.min_resolution = 300  # Minimum width/height in pixels
         self.max_file_size = 10 * 1024 * 1024  # 10MB
+        # JPEG encoder settings: 4:2:0 chroma subsampling at quality 90 is visually
+        # lossless for ID photos (recognition works on luminance) and encodes faster
+        self.jpeg_save_options = {"quality": 90, "subsampling": "4:2:0", "optimize": False, "progressive": False}
         
         # Ensure storage directory exists
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        
+        # Names of files in the storage directory, refreshed with one scandir at most
+        # every name_cache_ttl seconds so existence checks avoid a stat per file
+        self._storage_dir = os.path.abspath(self.storage_path)
+        self._name_cache: Optional[set] = None
+        self._name_cache_ts = 0.0
+        self.name_cache_ttl = 1.0
     
     def validate_format(self, photograph_format: str) -> None:
         """
@@ -94,39 +154,71 @@ class PhotographService:
         
         return width, height
     
-    def decode_base64_image(self, base64_string: str) -> Image.Image:
+    def decode_base64_data(self, base64_string: str) -> bytes:
         """
-        Decode base64 string to PIL Image
+        Decode base64 string to raw image bytes
         
         Args:
-            base64_string: Base64 encoded image string
+            base64_string: Base64 encoded image string (optionally a data URL)
             
         Returns:
-            PIL Image object
+            Decoded bytes
             
         Raises:
             PhotographValidationError: If decoding fails
         """
         try:
-            # Remove data URL prefix if present
-            if "," in base64_string:
-                base64_string = base64_string.split(",")[1]
+            # Remove data URL prefix if present (single scan from the right)
+            base64_string = base64_string.rpartition(",")[2]
             
-            # Decode base64
-            image_data = base64.b64decode(base64_string)
+            # a2b_base64 reads an ASCII str in place; b64decode would first
+            # copy the whole payload with str.encode()
+            return binascii.a2b_base64(base64_string)
             
-            # Open image
-            image = Image.open(io.BytesIO(image_data))
+        except Exception as e:
+            logger.error(f"Failed to decode base64 image: {str(e)}")
+            raise PhotographValidationError(
+                error_code="E010",
+                message="Failed to decode photograph. Invalid base64 encoding"
+            )
+    
+    def open_image(self, image_data: bytes) -> Image.Image:
+        """
+        Open raw image bytes as a PIL Image
+        
+        Args:
+            image_data: Raw image bytes
             
-            return image
+        Returns:
+            PIL Image object
             
+        Raises:
+            PhotographValidationError: If the bytes are not a readable image
+        """
+        try:
+            return Image.open(io.BytesIO(image_data))
         except Exception as e:
-            logger.error(f"Failed to decode base64 image: {str(e)}")
+            logger.error(f"Failed to open image: {str(e)}")
             raise PhotographValidationError(
                 error_code="E010",
                 message="Failed to decode photograph. Invalid base64 encoding"
             )
     
+    def decode_base64_image(self, base64_string: str) -> Image.Image:
+        """
+        Decode base64 string to PIL Image
+        
+        Args:
+            base64_string: Base64 encoded image string
+            
+        Returns:
+            PIL Image object
+            
+        Raises:
+            PhotographValidationError: If decoding fails
+        """
+        return self.open_image(self.decode_base64_data(base64_string))
+    
     def validate_photograph(self, base64_string: str, photograph_format: str) -> Tuple[Image.Image, int, int, int]:
         """
         Perform complete photograph validation
@@ -138,22 +230,61 @@ class PhotographService:
         Returns:
             Tuple of (image, width, height, file_size)
             
+        Raises:
+            PhotographValidationError: If validation fails
+        """
+        # Validate format before paying for the decode
+        self.validate_format(photograph_format)
+        
+        image_data = self.decode_base64_data(base64_string)
+        return self.validate_photograph_bytes(image_data, photograph_format)
+    
+    def validate_photograph_bytes(self, image_data: bytes, photograph_format: str) -> Tuple[Image.Image, int, int, int]:
+        """
+        Perform complete photograph validation on raw image bytes
+        
+        Args:
+            image_data: Raw image bytes (e.g. a multipart upload)
+            photograph_format: Expected image format
+            
+        Returns:
+            Tuple of (image, width, height, file_size)
+            
         Raises:
             PhotographValidationError: If validation fails
         """
         # Validate format
         self.validate_format(photograph_format)
         
-        # Calculate file size
-        file_size = len(base64_string)
+        # Measure the actual file size (not a base64 length)
+        file_size = len(image_data)
         self.validate_size(file_size)
         
-        # Decode image
-        image = self.decode_base64_image(base64_string)
+        # Reject undersized PNG/JPEG images from their headers before PIL touches them
+        dimensions = read_image_dimensions(image_data)
+        if dimensions and min(dimensions) < self.min_resolution:
+            raise PhotographValidationError(
+                error_code="E009",
+                message=f"Image resolution too low. Minimum required: {self.min_resolution}x{self.min_resolution} pixels"
+            )
+        
+        # Open image
+        image = self.open_image(image_data)
         
         # Validate resolution
         width, height = self.validate_resolution(image)
         
+        # Decode the pixels now so corrupt data fails validation and PIL
+        # releases the source buffer
+        try:
+            image.load()
+        except Exception as e:
+            logger.error(f"Failed to decode image data: {str(e)}")
+            raise PhotographValidationError(
+                error_code="E010",
+                message="Failed to decode photograph. Image data is corrupted"
+            )
+        
         # Verify image format is supported (be lenient - PIL can convert)
         image_format = image.format.lower() if image.format else ""
         # Accept any format that PIL can read and convert to JPEG/PNG
@@ -171,15 +302,20 @@ class PhotographService:
         return image, width, height, file_size
     
     async def save_photograph(self, application_id: str, photograph_base64: str = None, 
-                             image: Image.Image = None, format: str = "jpg") -> str:
+                             image: Image.Image = None, format: str = "jpg",
+                             photograph_bytes: bytes = None) -> str:
         """
-        Save photograph to local storage (accepts either base64 or PIL Image)
+        Save photograph to local storage (accepts base64, raw bytes or PIL Image)
+        
+        Decoding, validation and encoding are CPU-bound, so they run in a worker
+        thread instead of blocking the event loop.
         
         Args:
             application_id: Unique application identifier
             photograph_base64: Base64 encoded image (optional)
             image: PIL Image object (optional)
             format: Image format for saving
+            photograph_bytes: Raw image bytes (optional)
             
         Returns:
             File path where photograph was saved
@@ -188,39 +324,59 @@ class PhotographService:
             Exception: If save operation fails
         """
         try:
-            # If base64 provided, validate and decode first
-            if photograph_base64:
-                image, width, height, file_size = self.validate_photograph(photograph_base64, format)
-            elif image is None:
-                raise ValueError("Either photograph_base64 or image must be provided")
-            
-            # Normalize format
-            save_format = "JPEG" if format.lower() in ["jpg", "jpeg"] else "PNG"
-            extension = "jpg" if format.lower() in ["jpg", "jpeg"] else "png"
-            
-            # Generate file path
-            file_path = self.storage_path / f"{application_id}.{extension}"
-            
-            # Convert RGBA to RGB if saving as JPEG
-            if save_format == "JPEG" and image.mode == "RGBA":
-                rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-                rgb_image.paste(image, mask=image.split()[3] if len(image.split()) == 4 else None)
-                image = rgb_image
-            
-            # Save image
-            image.save(file_path, format=save_format, quality=95)
-            
-            # Set secure file permissions
-            security_manager.set_secure_file_permissions(str(file_path))
-            
-            logger.info(f"Photograph saved with secure permissions: {file_path}")
-            
-            return str(file_path)
-            
+            return await asyncio.to_thread(
+                self._store_photograph, application_id, photograph_base64,
+                photograph_bytes, image, format
+            )
         except Exception as e:
             logger.error(f"Failed to save photograph: {str(e)}")
             raise
     
+    def _store_photograph(self, application_id: str, photograph_base64: Optional[str],
+                          photograph_bytes: Optional[bytes], image: Optional[Image.Image],
+                          format: str) -> str:
+        """Validate (if needed), encode and write a photograph (blocking)"""
+        # If base64 or raw bytes provided, validate and decode first
+        if photograph_base64:
+            image, width, height, file_size = self.validate_photograph(photograph_base64, format)
+        elif photograph_bytes:
+            image, width, height, file_size = self.validate_photograph_bytes(photograph_bytes, format)
+        elif image is None:
+            raise ValueError("Either photograph_base64, photograph_bytes or image must be provided")
+        
+        # Normalize format
+        save_format = "JPEG" if format.lower() in ["jpg", "jpeg"] else "PNG"
+        extension = "jpg" if format.lower() in ["jpg", "jpeg"] else "png"
+        
+        # Generate file path
+        file_path = self.storage_path / f"{application_id}.{extension}"
+        
+        # Convert RGBA to RGB if saving as JPEG
+        if save_format == "JPEG" and image.mode == "RGBA":
+            rgb_image = Image.new("RGB", image.size, (255, 255, 255))
+            rgb_image.paste(image, mask=image.getchannel("A"))
+            image = rgb_image
+        
+        # Write to a temp file created owner-only (0600), then atomically move it
+        # into place so readers never see a partial or world-readable file
+        temp_path = file_path.with_name(file_path.name + ".tmp")
+        fd = os.open(temp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        try:
+            save_options = self.jpeg_save_options if save_format == "JPEG" else {}
+            with os.fdopen(fd, "wb") as f:
+                image.save(f, format=save_format, **save_options)
+            os.replace(temp_path, file_path)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+        
+        if self._name_cache is not None:
+            self._name_cache.add(file_path.name)
+        
+        logger.info(f"Photograph saved with secure permissions: {file_path}")
+        
+        return str(file_path)
+    
     def get_photograph_path(self, application_id: str, photograph_format: str) -> str:
         """
         Generate photograph file path
@@ -249,6 +405,8 @@ class PhotographService:
             path = Path(file_path)
             if path.exists():
                 path.unlink()
+                if self._name_cache is not None:
+                    self._name_cache.discard(path.name)
                 logger.info(f"Photograph deleted: {file_path}")
                 return True
             return False
@@ -266,7 +424,21 @@ class PhotographService:
         Returns:
             True if exists, False otherwise
         """
-        return Path(file_path).exists()
+        directory, name = os.path.split(os.path.abspath(file_path))
+        if directory != self._storage_dir:
+            return os.path.exists(file_path)
+        
+        now = time.monotonic()
+        if self._name_cache is None or now - self._name_cache_ts > self.name_cache_ttl:
+            with os.scandir(self._storage_dir) as entries:
+                self._name_cache = {entry.name for entry in entries}
+            self._name_cache_ts = now
+        
+        if name in self._name_cache:
+            return True
+        
+        # Not seen in the last scan - it may have been written since
+        return os.path.exists(file_path)
 
 
 # Global photograph service instance
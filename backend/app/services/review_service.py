@@ -1,22 +1,144 @@
 """Review service for duplicate case presentation and comparison"""
 
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List
 from pathlib import Path
 
+from app.core.config import settings
 from app.core.logging import logger
+from app.database.mongodb import get_database
 from app.database.repositories import ApplicationRepository
 from app.models.application import Application
+from app.services.cache_service import SimpleCacheService
+
+
+# Read-only band fields shared by every indicator dict in that band
+_HIGH_BAND = MappingProxyType({
+    "confidence_band": "high",
+    "confidence_label": "Very High Confidence",
+    "confidence_color": "green"
+})
+_MEDIUM_BAND = MappingProxyType({
+    "confidence_band": "medium",
+    "confidence_label": "Medium Confidence",
+    "confidence_color": "yellow"
+})
+_LOW_BAND = MappingProxyType({
+    "confidence_band": "low",
+    "confidence_label": "Low Confidence",
+    "confidence_color": "red"
+})
+
+
+def _confidence_band(milli: int) -> MappingProxyType:
+    """Band fields for a confidence score expressed in thousandths"""
+    if milli >= 950:
+        return _HIGH_BAND
+    if milli >= 850:
+        return _MEDIUM_BAND
+    return _LOW_BAND
+
+
+# Lookup tables indexed by round(confidence_score * 1000) (scores are quantized
+# to 0.001 before lookup, so the index is exact at every band boundary)
+_BAND_LUT = tuple(_confidence_band(milli) for milli in range(1001))
+_BORDERLINE_LUT = tuple(830 <= milli <= 870 for milli in range(1001))
+
+
+@lru_cache(maxsize=1024)
+def _similarity_indicators(confidence_score: float,
+                           current_quality: Optional[float],
+                           matched_quality: Optional[float]) -> Mapping[str, Any]:
+    """
+    Pure similarity indicator computation (memoized on quantized inputs)
+    
+    The result is shared by every caller with the same inputs, so it and
+    its nested sections are read-only; callers copy before handing it out.
+    """
+    # Determine confidence band
+    milli = min(1000, max(0, round(confidence_score * 1000)))
+    
+    # Calculate quality comparison
+    quality_diff = 0.0
+    if current_quality is not None and matched_quality is not None:
+        quality_diff = abs(current_quality - matched_quality)
+    
+    # Determine if borderline
+    is_borderline = _BORDERLINE_LUT[milli]
+    
+    return MappingProxyType({
+        "confidence_score": confidence_score,
+        "confidence_percentage": round(confidence_score * 100, 2),
+        **_BAND_LUT[milli],
+        "is_borderline": is_borderline,
+        "quality_comparison": MappingProxyType({
+            "current_quality": current_quality or 0.0,
+            "matched_quality": matched_quality or 0.0,
+            "quality_difference": quality_diff,
+            "quality_similar": quality_diff < 0.1
+        }),
+        "visual_indicators": MappingProxyType({
+            "face_match_icon": "✓" if confidence_score >= 0.85 else "✗",
+            "quality_match_icon": "✓" if quality_diff < 0.1 else "⚠",
+            "review_required_icon": "⚠" if is_borderline else ""
+        })
+    })
+
+
+# Every attribute read by the review summary, resolved in one call
+_SUMMARY_FIELDS = attrgetter(
+    "application_id",
+    "applicant_data.name", "applicant_data.email", "applicant_data.phone",
+    "applicant_data.date_of_birth", "applicant_data.address",
+    "photograph.path", "photograph.url", "photograph.format",
+    "photograph.width", "photograph.height", "photograph.uploaded_at",
+    "processing.status", "processing.face_detected", "processing.quality_score",
+    "processing.error_code", "processing.error_message",
+    "created_at", "updated_at",
+)
+
+
+# Applicant fields shown side by side: (name, display getter, getter compared for a match).
+# Name and email match on the case-folded copies stored with the applicant data
+_COMPARISON_FIELDS = (
+    ("name", attrgetter("applicant_data.name"), attrgetter("applicant_data.name_lower")),
+    ("email", attrgetter("applicant_data.email"), attrgetter("applicant_data.email_lower")),
+    ("phone", attrgetter("applicant_data.phone"), attrgetter("applicant_data.phone")),
+    ("date_of_birth", attrgetter("applicant_data.date_of_birth"), attrgetter("applicant_data.date_of_birth")),
+)
+
+
+# Photograph storage directory, resolved once at import
+_STORAGE_PATH = Path(settings.STORAGE_PATH)
+_STORAGE_PATH_STR = str(_STORAGE_PATH)
+
+
+@lru_cache(maxsize=8192)
+def _photograph_paths(application_id: str, matched_application_id: str) -> Mapping[str, str]:
+    """Photograph paths for a comparison pair (deterministic in the IDs, read-only as it is shared)"""
+    return MappingProxyType({
+        "current_photograph": str(_STORAGE_PATH / f"{application_id}.jpg"),
+        "matched_photograph": str(_STORAGE_PATH / f"{matched_application_id}.jpg"),
+        "storage_base_path": _STORAGE_PATH_STR
+    })
 
 
 class ReviewService:
     """Service for building duplicate case presentations"""
     
     def __init__(self):
+        # Built summaries / field comparisons keyed by (application_id, updated_at):
+        # any write bumps updated_at, so entries never go stale
+        self._summary_cache = SimpleCacheService(default_ttl=3600, max_size=4096)
+        self._field_comparison_cache = SimpleCacheService(default_ttl=3600, max_size=4096)
+        
         logger.info("Review service initialized")
     
     def _build_application_summary(self, application: Application) -> Dict[str, Any]:
         """
-        Build summary data for an application
+        Build summary data for an application (memoized per application version)
         
         Args:
             application: Application object
@@ -24,32 +146,47 @@ class ReviewService:
         Returns:
             Dictionary with application summary
         """
+        key = (application.application_id, application.updated_at)
+        summary = self._summary_cache.get(key)
+        if summary is None:
+            summary = self._summarize_application(application)
+            self._summary_cache.set(key, summary)
+        return summary
+    
+    def _summarize_application(self, application: Application) -> Dict[str, Any]:
+        """Serialize the fields shown for an application in the review UI"""
+        (application_id,
+         name, email, phone, date_of_birth, address,
+         path, url, photo_format, width, height, uploaded_at,
+         status, face_detected, quality_score, error_code, error_message,
+         created_at, updated_at) = _SUMMARY_FIELDS(application)
+        
         return {
-            "application_id": application.application_id,
+            "application_id": application_id,
             "applicant_data": {
-                "name": application.applicant_data.name,
-                "email": application.applicant_data.email,
-                "phone": application.applicant_data.phone,
-                "date_of_birth": application.applicant_data.date_of_birth,
-                "address": application.applicant_data.address
+                "name": name,
+                "email": email,
+                "phone": phone,
+                "date_of_birth": date_of_birth,
+                "address": address
             },
             "photograph": {
-                "path": application.photograph.path,
-                "url": application.photograph.url,
-                "format": application.photograph.format,
-                "width": application.photograph.width,
-                "height": application.photograph.height,
-                "uploaded_at": application.photograph.uploaded_at.isoformat()
+                "path": path,
+                "url": url,
+                "format": photo_format,
+                "width": width,
+                "height": height,
+                "uploaded_at": uploaded_at
             },
             "processing": {
-                "status": application.processing.status,
-                "face_detected": application.processing.face_detected,
-                "quality_score": application.processing.quality_score,
-                "error_code": application.processing.error_code,
-                "error_message": application.processing.error_message
+                "status": status,
+                "face_detected": face_detected,
+                "quality_score": quality_score,
+                "error_code": error_code,
+                "error_message": error_message
             },
-            "created_at": application.created_at.isoformat(),
-            "updated_at": application.updated_at.isoformat()
+            "created_at": created_at,
+            "updated_at": updated_at
         }
     
     def _calculate_similarity_indicators(self, confidence_score: float,
@@ -66,54 +203,28 @@ class ReviewService:
         Returns:
             Dictionary with similarity indicators
         """
-        # Determine confidence band
-        if confidence_score >= 0.95:
-            confidence_band = "high"
-            confidence_label = "Very High Confidence"
-            confidence_color = "green"
-        elif confidence_score >= 0.85:
-            confidence_band = "medium"
-            confidence_label = "Medium Confidence"
-            confidence_color = "yellow"
-        else:
-            confidence_band = "low"
-            confidence_label = "Low Confidence"
-            confidence_color = "red"
-        
-        # Calculate quality comparison
-        quality_diff = 0.0
-        if current_quality is not None and matched_quality is not None:
-            quality_diff = abs(current_quality - matched_quality)
-        
-        # Determine if borderline
-        is_borderline = 0.83 <= confidence_score <= 0.87
+        # Inputs are quantized (score to 0.001, quality to 0.01) so realistic
+        # scores collide and hit the cache; the band cut-offs are far coarser
+        indicators = _similarity_indicators(
+            round(confidence_score, 3),
+            round(current_quality, 2) if current_quality is not None else None,
+            round(matched_quality, 2) if matched_quality is not None else None
+        )
         
+        # The memoized result is shared; give the caller its own dicts
         return {
-            "confidence_score": confidence_score,
-            "confidence_percentage": round(confidence_score * 100, 2),
-            "confidence_band": confidence_band,
-            "confidence_label": confidence_label,
-            "confidence_color": confidence_color,
-            "is_borderline": is_borderline,
-            "quality_comparison": {
-                "current_quality": current_quality or 0.0,
-                "matched_quality": matched_quality or 0.0,
-                "quality_difference": quality_diff,
-                "quality_similar": quality_diff < 0.1
-            },
-            "visual_indicators": {
-                "face_match_icon": "✓" if confidence_score >= 0.85 else "✗",
-                "quality_match_icon": "✓" if quality_diff < 0.1 else "⚠",
-                "review_required_icon": "⚠" if is_borderline else ""
-            }
+            **indicators,
+            "quality_comparison": dict(indicators["quality_comparison"]),
+            "visual_indicators": dict(indicators["visual_indicators"])
         }
     
-    async def build_comparison_view(self, application_id: str) -> Dict[str, Any]:
+    async def build_comparison_view(self, application_id: str, db=None) -> Dict[str, Any]:
         """
         Build comprehensive comparison view for duplicate case
         
         Args:
             application_id: Application ID to build comparison for
+            db: Database connection (defaults to the shared connection)
             
         Returns:
             Dictionary with comparison view data
@@ -122,8 +233,14 @@ class ReviewService:
             ValueError: If application not found or not a duplicate
         """
         try:
-            # Get current application
-            current_app = await application_repository.get_by_id(application_id)
+            # Get database connection if not provided
+            if db is None:
+                db = await get_database()
+            
+            application_repository = ApplicationRepository(db)
+            
+            # Current and top matched application in one round trip
+            current_app, matched_app = await application_repository.get_comparison_pair(application_id)
             
             if not current_app:
                 raise ValueError(f"Application {application_id} not found")
@@ -132,14 +249,9 @@ class ReviewService:
             if not current_app.result.is_duplicate:
                 raise ValueError(f"Application {application_id} is not marked as duplicate")
             
-            # Get matched application
-            matched_app = None
             confidence_score = 0.0
-            
-            if current_app.result.matched_applications and len(current_app.result.matched_applications) > 0:
-                matched_app_id = current_app.result.matched_applications[0].matched_application_id
+            if current_app.result.matched_applications:
                 confidence_score = current_app.result.matched_applications[0].confidence_score
-                matched_app = await application_repository.get_by_id(matched_app_id)
             
             if not matched_app:
                 raise ValueError(f"Matched application not found for {application_id}")
@@ -155,6 +267,10 @@ class ReviewService:
                 matched_quality=matched_app.processing.quality_score
             )
             
+            # Hoisted so the view below is a single flat literal
+            result = current_app.result
+            is_borderline = similarity_indicators["is_borderline"]
+            
             # Build comparison view
             comparison_view = {
                 "case_id": application_id,
@@ -163,11 +279,11 @@ class ReviewService:
                 "similarity_indicators": similarity_indicators,
                 "review_metadata": {
                     "requires_review": is_borderline or confidence_score < 0.90,
-                    "review_priority": "high" if similarity_indicators["is_borderline"] else "normal",
-                    "reviewed": current_app.result.reviewed_by is not None,
-                    "reviewed_by": current_app.result.reviewed_by,
-                    "review_notes": current_app.result.review_notes,
-                    "reviewed_at": current_app.result.reviewed_at.isoformat() if current_app.result.reviewed_at else None
+                    "review_priority": "high" if is_borderline else "normal",
+                    "reviewed": result.reviewed_by is not None,
+                    "reviewed_by": result.reviewed_by,
+                    "review_notes": result.review_notes,
+                    "reviewed_at": result.reviewed_at
                 },
                 "comparison_fields": self._build_field_comparison(current_app, matched_app)
             }
@@ -192,28 +308,25 @@ class ReviewService:
         Returns:
             Dictionary with field comparisons
         """
-        return {
-            "name": {
-                "current": current_app.applicant_data.name,
-                "matched": matched_app.applicant_data.name,
-                "match": current_app.applicant_data.name.lower() == matched_app.applicant_data.name.lower()
-            },
-            "email": {
-                "current": current_app.applicant_data.email,
-                "matched": matched_app.applicant_data.email,
-                "match": current_app.applicant_data.email.lower() == matched_app.applicant_data.email.lower()
-            },
-            "phone": {
-                "current": current_app.applicant_data.phone,
-                "matched": matched_app.applicant_data.phone,
-                "match": current_app.applicant_data.phone == matched_app.applicant_data.phone
-            },
-            "date_of_birth": {
-                "current": current_app.applicant_data.date_of_birth,
-                "matched": matched_app.applicant_data.date_of_birth,
-                "match": current_app.applicant_data.date_of_birth == matched_app.applicant_data.date_of_birth
+        key = (current_app.application_id, current_app.updated_at,
+               matched_app.application_id, matched_app.updated_at)
+        comparison = self._field_comparison_cache.get(key)
+        if comparison is None:
+            comparison = self._compare_fields(current_app, matched_app)
+            self._field_comparison_cache.set(key, comparison)
+        return comparison
+    
+    def _compare_fields(self, current_app: Application,
+                        matched_app: Application) -> Dict[str, Any]:
+        """Compare applicant fields between two applications"""
+        comparison = {}
+        for field, getter, match_key in _COMPARISON_FIELDS:
+            comparison[field] = {
+                "current": getter(current_app),
+                "matched": getter(matched_app),
+                "match": match_key(current_app) == match_key(matched_app)
             }
-        }
+        return comparison
     
     def get_photograph_paths(self, application_id: str, 
                             matched_application_id: str) -> Dict[str, str]:
@@ -227,15 +340,7 @@ class ReviewService:
         Returns:
             Dictionary with photograph paths
         """
-        from app.core.config import settings
-        
-        storage_path = Path(settings.STORAGE_PATH)
-        
-        return {
-            "current_photograph": str(storage_path / f"{application_id}.jpg"),
-            "matched_photograph": str(storage_path / f"{matched_application_id}.jpg"),
-            "storage_base_path": str(storage_path)
-        }
+        return dict(_photograph_paths(application_id, matched_application_id))
     
     async def get_review_statistics(self) -> Dict[str, Any]:
         """
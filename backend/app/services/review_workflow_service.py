@@ -1,5 +1,6 @@
 """Review workflow integration service"""
 
+import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
@@ -18,9 +19,78 @@ class ReviewWorkflowService:
     and managing the complete review workflow
     """
     
+    # Decision micro-batching: a batch closes at MAX_BATCH items or MAX_WAIT_MS
+    # after its first item, whichever comes first
+    MAX_BATCH = 32
+    MAX_WAIT_MS = 10
+    
     def __init__(self):
+        # Pending (db, decision, future) items, drained by a background worker
+        self._decision_queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        
         logger.info("Review workflow service initialized")
     
+    def _ensure_batch_worker(self) -> asyncio.Queue:
+        """Start the decision batching worker on the running loop if needed"""
+        if self._batch_worker is None or self._batch_worker.done():
+            self._decision_queue = asyncio.Queue()
+            self._batch_worker = asyncio.create_task(self._run_decision_batches())
+        return self._decision_queue
+    
+    async def _enqueue_decision(self, db, decision: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue one override decision and wait for its batch to be applied"""
+        queue = self._ensure_batch_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((db, decision, future))
+        return await future
+    
+    async def _run_decision_batches(self):
+        """Collect queued decisions into batches and apply them"""
+        loop = asyncio.get_running_loop()
+        queue = self._decision_queue
+        
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.MAX_WAIT_MS / 1000
+            
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._apply_decision_batch(batch)
+            except Exception as e:
+                logger.error(f"Review decision batch failed: {str(e)}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    async def _apply_decision_batch(self, batch: List[tuple]):
+        """Apply one batch of decisions (grouped by database handle)"""
+        by_db: Dict[int, List[tuple]] = {}
+        for item in batch:
+            by_db.setdefault(id(item[0]), []).append(item)
+        
+        for items in by_db.values():
+            outcomes = await override_service.apply_override_bulk(
+                [decision for _, decision, _ in items],
+                db=items[0][0]
+            )
+            
+            for (_, _, future), outcome in zip(items, outcomes):
+                if future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+    
     async def get_pending_reviews(
         self,
         db,
@@ -40,33 +110,49 @@ class ReviewWorkflowService:
         """
         app_repo = ApplicationRepository(db)
         
-        # Get applications with pending_review status
-        applications = await app_repo.get_by_status(
+        review_cases = []
+        matched_ids = {}
+        
+        # Rows are built while streaming projected pending_review documents;
+        # no Application objects are materialized for the list
+        async for doc in app_repo.iter_review_rows(
             status=ApplicationStatus.PENDING_REVIEW,
             limit=limit,
             skip=skip
-        )
-        
-        review_cases = []
-        for app in applications:
+        ):
+            result = doc.get("result", {})
+            
             # Get duplicate match details if available
             matched_app_id = None
             confidence_score = None
             
-            if app.result.matches:
-                matched_app_id = app.result.matches[0].get("matched_application_id")
-                confidence_score = app.result.matches[0].get("confidence_score")
+            matches = result.get("matched_applications")
+            if matches:
+                matched_app_id = matches[0].get("matched_application_id")
+                confidence_score = matches[0].get("confidence_score")
+                matched_ids[len(review_cases)] = matched_app_id
             
             review_cases.append({
-                "application_id": app.application_id,
-                "applicant_name": app.applicant_data.name,
+                "application_id": doc["application_id"],
+                "applicant_name": doc.get("applicant_data", {}).get("name"),
                 "matched_application_id": matched_app_id,
+                "matched_applicant_name": None,
+                "matched_identity_id": None,
                 "confidence_score": confidence_score,
-                "created_at": app.created_at,
+                "created_at": doc.get("created_at"),
                 "requires_review": True,
-                "review_reason": app.result.review_reason
+                "review_reason": result.get("review_reason")
             })
         
+        # Fill in every matched application from one $in query instead of one
+        # get_by_id per row when the reviewer expands the case
+        matched_apps = await app_repo.get_many_by_ids(list(matched_ids.values()))
+        for index, matched_app_id in matched_ids.items():
+            matched_app = matched_apps.get(matched_app_id)
+            if matched_app:
+                review_cases[index]["matched_applicant_name"] = matched_app.applicant_data.name
+                review_cases[index]["matched_identity_id"] = matched_app.result.identity_id
+        
         logger.info(f"Retrieved {len(review_cases)} pending reviews")
         return review_cases
     
@@ -88,7 +174,7 @@ class ReviewWorkflowService:
         app_repo = ApplicationRepository(db)
         
         # Get current application
-        application = await app_repo.get_by_id(application_id)
+        application = await app_repo.get_by_id_lite(application_id)
         if not application:
             return None
         
@@ -97,7 +183,7 @@ class ReviewWorkflowService:
         if application.result.is_duplicate and application.result.matches:
             matched_app_id = application.result.matches[0].get("matched_application_id")
             if matched_app_id:
-                matched_application = await app_repo.get_by_id(matched_app_id)
+                matched_application = await app_repo.get_by_id_lite(matched_app_id)
         
         # Build detailed response
         details = {
@@ -107,7 +193,7 @@ class ReviewWorkflowService:
                 "applicant_email": application.applicant_data.email,
                 "photograph_path": application.photograph.path,
                 "quality_score": application.processing.quality_score,
-                "created_at": application.created_at.isoformat()
+                "created_at": application.created_at
             },
             "matched_application": None,
             "confidence_score": None,
@@ -122,7 +208,7 @@ class ReviewWorkflowService:
                 "applicant_email": matched_application.applicant_data.email,
                 "photograph_path": matched_application.photograph.path,
                 "identity_id": matched_application.result.identity_id,
-                "created_at": matched_application.created_at.isoformat()
+                "created_at": matched_application.created_at
             }
             details["confidence_score"] = application.result.matches[0].get("confidence_score")
         
@@ -152,14 +238,13 @@ class ReviewWorkflowService:
             Result of review decision
         """
         try:
-            # Apply override decision
-            result = await override_service.apply_override(
-                application_id=application_id,
-                decision=decision,
-                justification=justification,
-                admin_id=reviewer_id,
-                db=db
-            )
+            # Apply override decision (coalesced with concurrent submissions)
+            result = await self._enqueue_decision(db, {
+                "application_id": application_id,
+                "decision": decision,
+                "justification": justification,
+                "admin_id": reviewer_id
+            })
             
             # Send notification if webhook configured
             if webhook_url:
@@ -203,10 +288,9 @@ class ReviewWorkflowService:
         """
         app_repo = ApplicationRepository(db)
         
-        # Get counts by status
-        pending_reviews = await app_repo.get_by_status(
-            status=ApplicationStatus.PENDING_REVIEW,
-            limit=1000
+        # Count and average age computed by the database in one pipeline
+        pending_count, avg_age_days = await app_repo.count_and_avg_age(
+            ApplicationStatus.PENDING_REVIEW
         )
         
         # Get audit statistics for overrides
@@ -217,31 +301,19 @@ class ReviewWorkflowService:
         )
         
         return {
-            "pending_reviews": len(pending_reviews),
+            "pending_reviews": pending_count,
             "total_overrides": audit_stats.get("override_count", 0),
-            "review_backlog_age_days": self._calculate_backlog_age(pending_reviews)
+            "review_backlog_age_days": round(avg_age_days, 2)
         }
     
-    def _calculate_backlog_age(self, applications: List) -> float:
-        """Calculate average age of review backlog in days"""
-        if not applications:
-            return 0.0
-        
-        now = datetime.utcnow()
-        total_age = sum(
-            (now - app.created_at).total_seconds() / 86400
-            for app in applications
-        )
-        
-        return round(total_age / len(applications), 2)
-    
     async def bulk_review_decision(
         self,
         db,
         application_ids: List[str],
         decision: str,
         justification: str,
-        reviewer_id: str
+        reviewer_id: str,
+        webhook_url: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Apply review decision to multiple applications
@@ -252,6 +324,7 @@ class ReviewWorkflowService:
             decision: Review decision
             justification: Justification for decision
             reviewer_id: Reviewer user ID
+            webhook_url: Optional webhook URL, notified once for the whole batch
             
         Returns:
             Bulk operation results
@@ -263,22 +336,45 @@ class ReviewWorkflowService:
             "errors": []
         }
         
-        for app_id in application_ids:
-            try:
-                await self.submit_review_decision(
+        # Enqueue everything at once; the batching worker applies them in
+        # groups of up to MAX_BATCH with one bulk write per group
+        outcomes = await asyncio.gather(
+            *(
+                self.submit_review_decision(
                     db=db,
                     application_id=app_id,
                     decision=decision,
                     justification=justification,
                     reviewer_id=reviewer_id
                 )
-                results["successful"] += 1
-            except Exception as e:
+                for app_id in application_ids
+            ),
+            return_exceptions=True
+        )
+        
+        reviewed = []
+        for app_id, outcome in zip(application_ids, outcomes):
+            if isinstance(outcome, Exception):
                 results["failed"] += 1
                 results["errors"].append({
                     "application_id": app_id,
-                    "error": str(e)
+                    "error": str(outcome)
                 })
+            else:
+                results["successful"] += 1
+                reviewed.append({
+                    "application_id": app_id,
+                    "status": outcome["new_status"]
+                })
+        
+        # One webhook for the batch rather than one POST per application
+        if webhook_url:
+            await notification_service.notify_bulk_review(
+                applications=reviewed,
+                decision=decision,
+                reviewed_by=reviewer_id,
+                webhook_url=webhook_url
+            )
         
         logger.info(
             f"Bulk review completed: {results['successful']}/{results['total']} "
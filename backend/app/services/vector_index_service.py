@@ -1,9 +1,16 @@
 """FAISS vector index service for efficient similarity search"""
 
+import asyncio
+import os
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
 import faiss
 import numpy as np
-import json
-import pickle
+import orjson
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any
 
@@ -11,36 +18,342 @@ from app.core.config import settings
 from app.core.logging import logger
 
 
+# Index types whose quantizers must be trained before vectors can be added
+TRAINED_INDEX_TYPES = ("ivf", "ivfsq8", "ivfpq", "ivfpqfs", "sq8")
+
+# Index types storing lossy codes: candidates are re-ranked exactly against
+# the vector cache
+REFINED_INDEX_TYPES = ("ivfsq8", "ivfpq", "ivfpqfs", "sq8")
+INDEX_TYPES = ("flat", "hnsw") + TRAINED_INDEX_TYPES
+
+# Write-ahead log record: op code, index ID and application ID length, followed by
+# the UTF-8 application ID and, for additions, the normalized float32 vector
+_WAL_HEADER = struct.Struct("<cqH")
+_WAL_ADD = b"A"
+_WAL_REMOVE = b"R"
+
+
+class _ReadWriteLock:
+    """Lock shared by any number of readers or held by a single writer"""
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+    
+    @contextmanager
+    def read(self):
+        """Hold the lock shared (concurrent searches)"""
+        with self._cond:
+            while self._writing:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def write(self):
+        """Hold the lock exclusively (index and mapping mutations)"""
+        with self._cond:
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
 class VectorIndexService:
     """Service for managing FAISS vector index for facial embeddings"""
     
+    # Changes are appended to a write-ahead log; the full index is only
+    # rewritten at checkpoints by a background thread (every CHECKPOINT_EVERY
+    # logged changes, CHECKPOINT_INTERVAL seconds when dirty) and on close
+    CHECKPOINT_EVERY = 10_000
+    CHECKPOINT_INTERVAL = 60.0
+    
+    # Concurrent add_embedding_async calls are coalesced into one
+    # add_with_ids of up to ADD_BATCH_SIZE vectors, waiting at most
+    # ADD_BATCH_WINDOW seconds for a batch to fill
+    ADD_BATCH_SIZE = 256
+    ADD_BATCH_WINDOW = 0.02
+    
+    # Concurrent search_similar_async calls are answered by one batched
+    # index search of up to SEARCH_BATCH_SIZE queries
+    SEARCH_BATCH_SIZE = 32
+    SEARCH_BATCH_WINDOW = 0.002
+    
     def __init__(self):
         self.dimension = settings.EMBEDDING_DIMENSION  # 512
         self.index_path = Path(settings.VECTOR_DB_PATH)
         self.index_file = self.index_path / "faiss.index"
-        self.mapping_file = self.index_path / "index_mapping.json"
+        self.mapping_file = self.index_path / "index_ids.bin"
+        self.legacy_mapping_file = self.index_path / "index_mapping.json"
+        self.wal_file = self.index_path / "wal.bin"
+        self.vectors_file = self.index_path / "vectors.npy"
+        
+        # Index structure: flat (exact O(N) scan), sq8 (exact scan over 8-bit
+        # codes), ivf / ivfsq8 / ivfpq / ivfpqfs (clustered, the last three
+        # also compress vectors: 8-bit scalar codes, PQ codes, 4-bit SIMD
+        # fast-scan blocks) or hnsw (graph, ~O(log N) search)
+        self.index_type = settings.FAISS_INDEX_TYPE.lower()
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported FAISS index type: {settings.FAISS_INDEX_TYPE}")
+        self.needs_training = self.index_type in TRAINED_INDEX_TYPES
         
         # FAISS IVF parameters for performance optimization
-        self.use_ivf = True  # Use IndexIVFFlat for faster approximate search
-        self.nlist = 100  # Number of clusters (optimal for 10k-100k vectors)
-        self.nprobe = 10  # Number of clusters to search (trade-off: speed vs accuracy)
+        self.nlist = settings.FAISS_NLIST  # Number of clusters (optimal for 10k-100k vectors)
+        self.nprobe = settings.FAISS_NPROBE  # Number of clusters to search (trade-off: speed vs accuracy)
+        self.pq_m = settings.FAISS_PQ_M  # PQ sub-quantizers (8-bit codes each, 4-bit for ivfpqfs)
+        
+        # Compressed indexes fetch k * refine_factor candidates for exact re-ranking
+        self.refine_factor = max(1, settings.FAISS_REFINE_FACTOR)
+        
+        # Vectors are L2-normalized on insert, so inner product is cosine
+        # similarity (indexes created before this used L2 and keep it)
+        self.metric = faiss.METRIC_INNER_PRODUCT
+        
+        # HNSW graph parameters
+        self.hnsw_m = settings.FAISS_HNSW_M
+        self.hnsw_ef_construction = settings.FAISS_HNSW_EF_CONSTRUCTION
+        self.hnsw_ef_search = settings.FAISS_HNSW_EF_SEARCH
+        
+        # Trained indexes start as an exact flat index and are promoted once
+        # this many vectors exist (~39 points per centroid is what k-means
+        # wants; SQ8 only learns per-dimension value ranges)
+        if self.index_type == "sq8":
+            self.train_size = 4096
+        else:
+            centroids = max(self.nlist, 256) if self.index_type == "ivfpq" else self.nlist
+            self.train_size = centroids * 39
+        
+        # Optional GPU mirror used for search; the CPU index stays the source
+        # of truth on disk and the mirror is re-copied lazily after changes
+        self.use_gpu = settings.FAISS_USE_GPU and self._gpu_available()
+        self.gpu_index = None
+        self._gpu_dirty = True
+        
+        # Memory-map the index on load; mapped IVF inverted lists are
+        # read-only, so such an index is read into memory before its first write
+        self.use_mmap = settings.FAISS_MMAP
+        self._read_only = False
+        
+        # Size FAISS's OpenMP pool so API worker processes do not oversubscribe
+        # the CPUs (batched searches parallelize over queries within it)
+        self.omp_threads = settings.FAISS_OMP_THREADS or max(
+            1, (os.cpu_count() or 1) // max(1, settings.API_WORKERS)
+        )
+        faiss.omp_set_num_threads(self.omp_threads)
+        
+        # SIMD levels the loaded FAISS build was compiled for (e.g. AVX2,
+        # AVX512); generic builds run the distance kernels several times slower
+        self.faiss_build = faiss.get_compile_options().strip()
+        logger.info(f"FAISS {faiss.__version__} build options: {self.faiss_build}")
         
         # Ensure storage directory exists
         self.index_path.mkdir(parents=True, exist_ok=True)
         
         # Initialize or load FAISS index
         self.index = None
-        self.index_to_application_id: Dict[int, str] = {}
+        # Index IDs are a dense counter, so the forward map is a list
+        # (None for removed entries); the reverse map is rebuilt from it
+        self.index_to_application_id: List[Optional[str]] = []
         self.application_id_to_index: Dict[str, int] = {}
         self.next_index_id = 0
         
+        # float16 copy of every normalized vector, row = index ID, so stored
+        # embeddings are read directly instead of reconstructed from FAISS
+        self._vectors = np.zeros((0, self.dimension), dtype=np.float16)
+        
+        # Staging buffer reused by batch inserts (grown when a batch exceeds
+        # it; only touched under the lock)
+        self._add_buffer = np.empty((self.ADD_BATCH_SIZE, self.dimension), dtype=np.float32)
+        
+        # Serializes index mutations with the background checkpoints
+        self._lock = threading.RLock()
+        
+        # FAISS indexes must not be searched while vectors are added or
+        # removed: searches (and their mapping / vector cache reads) hold this
+        # shared, mutations exclusive. Lock order: _lock, then _index_lock
+        self._index_lock = _ReadWriteLock()
+        self._wal = None
+        self._wal_records = 0
+        
         self._initialize_index()
         
-        logger.info(f"Vector index service initialized. Index size: {self.index.ntotal}, IVF enabled: {self.use_ivf}")
+        self._checkpoint_stop = threading.Event()
+        self._checkpoint_due = threading.Event()
+        self._checkpoint_thread = threading.Thread(
+            target=self._run_checkpoints, name="faiss-checkpoint", daemon=True
+        )
+        self._checkpoint_thread.start()
+        
+        # Enrollment queue drained by the add batcher
+        self._pending: List[Tuple[str, np.ndarray, Future]] = []
+        self._pending_ready = threading.Condition(threading.Lock())
+        self._add_batcher_thread = threading.Thread(
+            target=self._run_batcher,
+            args=(self._pending, self._pending_ready, self.ADD_BATCH_SIZE,
+                  self.ADD_BATCH_WINDOW, self._add_pending_batch),
+            name="faiss-add-batcher", daemon=True
+        )
+        self._add_batcher_thread.start()
+        
+        # Query queue drained by the search batcher
+        self._pending_queries: List[Tuple[np.ndarray, int, Future]] = []
+        self._queries_ready = threading.Condition(threading.Lock())
+        self._search_batcher_thread = threading.Thread(
+            target=self._run_batcher,
+            args=(self._pending_queries, self._queries_ready, self.SEARCH_BATCH_SIZE,
+                  self.SEARCH_BATCH_WINDOW, self._search_pending_batch),
+            name="faiss-search-batcher", daemon=True
+        )
+        self._search_batcher_thread.start()
+        
+        logger.info(
+            f"Vector index service initialized. Index size: {self.index.ntotal}, "
+            f"type: {self.index_type}, trained: {self.index_trained}, "
+            f"omp threads: {self.omp_threads}"
+        )
+    
+    def _gpu_available(self) -> bool:
+        """Check that this FAISS build can reach at least one GPU"""
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            logger.warning("FAISS_USE_GPU is set but no GPU FAISS build/device is available; searching on CPU")
+            return False
+        if self.index_type == "hnsw":
+            logger.warning("HNSW indexes cannot be moved to GPU; searching on CPU")
+            return False
+        return True
+    
+    def _sync_gpu_index(self):
+        """Copy the CPU index to the GPU(s)"""
+        if faiss.get_num_gpus() > 1:
+            self.gpu_index = faiss.index_cpu_to_all_gpus(self.index)
+        else:
+            if self.gpu_index is None:
+                self.gpu_res = faiss.StandardGpuResources()
+            self.gpu_index = faiss.index_cpu_to_gpu(self.gpu_res, 0, self.index)
+        self._gpu_dirty = False
+        logger.info(f"Copied index with {self.index.ntotal} vectors to GPU")
+    
+    def _refresh_gpu_index(self):
+        """Re-copy the GPU mirror if the CPU index changed (call before taking the read lock)"""
+        if not self.use_gpu or not self._gpu_dirty:
+            return
+        try:
+            with self._lock:
+                if self._gpu_dirty:
+                    self._sync_gpu_index()
+        except Exception as e:
+            logger.error(f"GPU index copy failed, searching on CPU: {str(e)}")
+            self.use_gpu = False
+    
+    def _tombstones(self) -> int:
+        """Number of removed vectors still stored in the index (HNSW cannot delete)"""
+        return max(0, self.index.ntotal - len(self.application_id_to_index))
+    
+    def _search_index(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Run a k-NN search on the GPU mirror when enabled, otherwise on CPU"""
+        # Removed vectors left in the index would take result slots, so fetch
+        # that many extra neighbours and drop them
+        tombstones = self._tombstones()
+        
+        if self.use_gpu and self.gpu_index is not None:
+            try:
+                distances, indices = self.gpu_index.search(queries, k + tombstones)
+                return self._drop_tombstones(distances, indices, k, tombstones)
+            except Exception as e:
+                logger.error(f"GPU search failed, falling back to CPU: {str(e)}")
+                self.use_gpu = False
+        
+        distances, indices = self.index.search(queries, k + tombstones)
+        return self._drop_tombstones(distances, indices, k, tombstones)
+    
+    def _drop_tombstones(self, distances: np.ndarray, indices: np.ndarray, k: int,
+                         tombstones: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Keep the first k neighbours per query whose IDs still map to an application"""
+        if not tombstones:
+            return distances, indices
+        
+        forward = self.index_to_application_id
+        live = np.array([
+            [0 <= idx < len(forward) and forward[idx] is not None for idx in row]
+            for row in indices.tolist()
+        ], dtype=bool).reshape(indices.shape)
+        
+        # Stable sort moves live neighbours to the front in distance order
+        order = np.argsort(~live, axis=1, kind="stable")[:, :k]
+        distances = np.take_along_axis(distances, order, axis=1)
+        indices = np.where(np.take_along_axis(live, order, axis=1),
+                           np.take_along_axis(indices, order, axis=1), -1)
+        return distances, indices
+    
+    def _search_refined(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """k-NN search that re-ranks compressed-code candidates exactly"""
+        if self.index_type not in REFINED_INDEX_TYPES or not self.index_trained or self.refine_factor == 1:
+            return self._search_index(queries, k)
+        
+        _, candidates = self._search_index(queries, k * self.refine_factor)
+        
+        # Exact inner products of the normalized queries with the cached vectors
+        valid = candidates != -1
+        vectors = self._vectors[np.where(valid, candidates, 0)].astype(np.float32)
+        scores = np.einsum("bkd,bd->bk", vectors, queries)
+        scores[~valid] = -np.inf
+        
+        order = np.argsort(-scores, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, order, axis=1)
+        indices = np.take_along_axis(np.where(valid, candidates, -1), order, axis=1)
+        
+        # Report scores in the index metric (squared L2 for legacy indexes)
+        if self.metric != faiss.METRIC_INNER_PRODUCT:
+            scores = 2.0 - 2.0 * scores
+        return scores, indices
+    
+    def _range_search(self, queries: np.ndarray, threshold: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the k closest matches to the first query at or above a similarity threshold"""
+        # Radius is padded slightly so matches exactly at the threshold are kept
+        # (FAISS compares strictly); the caller re-checks the threshold
+        inner_product = self.metric == faiss.METRIC_INNER_PRODUCT
+        if inner_product:
+            radius = threshold - 1e-6  # inner product above radius
+        else:
+            radius = 2.0 * (1.0 - threshold) + 1e-6  # squared L2 distance below radius
+        
+        # Range search runs on the CPU index (GPU indexes do not support it)
+        lims, distances, indices = self.index.range_search(queries, radius)
+        distances = distances[lims[0]:lims[1]]
+        indices = indices[lims[0]:lims[1]]
+        
+        if self._tombstones():
+            # Removed vectors must not take any of the k slots
+            forward = self.index_to_application_id
+            live = np.array([
+                idx < len(forward) and forward[idx] is not None for idx in indices.tolist()
+            ], dtype=bool)
+            distances, indices = distances[live], indices[live]
+        
+        # Best first, like search(); only the top k need a full sort
+        keys = -distances if inner_product else distances
+        if len(keys) > k:
+            top = np.argpartition(keys, k)[:k]
+            order = top[np.argsort(keys[top])]
+        else:
+            order = np.argsort(keys)
+        return distances[order], indices[order]
     
     def _initialize_index(self):
         """Initialize or load existing FAISS index"""
-        if self.index_file.exists() and self.mapping_file.exists():
+        if self.index_file.exists() and (self.mapping_file.exists() or self.legacy_mapping_file.exists()):
             # Load existing index
             self._load_index()
             logger.info(f"Loaded existing FAISS index from {self.index_file}")
@@ -48,35 +361,75 @@ class VectorIndexService:
             # Create new index
             self._create_new_index()
             logger.info(f"Created new FAISS index with dimension {self.dimension}")
+        
+        # Re-apply changes logged since the last snapshot, then keep appending
+        self._replay_wal()
+        self._wal = open(self.wal_file, "ab")
     
-    def _create_new_index(self):
-        """Create a new FAISS index with IVF optimization"""
-        if self.use_ivf:
+    def _build_index(self) -> faiss.Index:
+        """Build an empty index of the configured type"""
+        if self.index_type == "hnsw":
+            # Graph index: no training, logarithmic search
+            index = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, self.metric)
+            index.hnsw.efConstruction = self.hnsw_ef_construction
+            index.hnsw.efSearch = self.hnsw_ef_search
+            return index
+        
+        if self.index_type == "sq8":
+            # Exact scan over 8-bit scalar-quantized vectors (4x smaller than float32)
+            return faiss.IndexScalarQuantizer(
+                self.dimension, faiss.ScalarQuantizer.QT_8bit, self.metric
+            )
+        
+        if self.index_type == "ivf":
             # Use IndexIVFFlat for faster approximate search
-            # This is more efficient for larger datasets (>10k vectors)
-            quantizer = faiss.IndexFlatL2(self.dimension)
-            self.index = faiss.IndexIVFFlat(quantizer, self.dimension, self.nlist)
-            
-            # Set search parameters
-            self.index.nprobe = self.nprobe
-            
-            # Note: IVF index needs training before use
-            # Will be trained when we have enough data (>nlist vectors)
+            quantizer = faiss.IndexFlat(self.dimension, self.metric)
+            index = faiss.IndexIVFFlat(quantizer, self.dimension, self.nlist, self.metric)
+        elif self.index_type == "ivfsq8":
+            # IVF over 8-bit scalar codes: 4x smaller posting lists, SIMD int8 scan
+            quantizer = faiss.IndexFlat(self.dimension, self.metric)
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer, self.dimension, self.nlist, faiss.ScalarQuantizer.QT_8bit, self.metric
+            )
+        elif self.index_type == "ivfpqfs":
+            # IVF with 4-bit PQ codes packed in 32-vector blocks for SIMD fast-scan
+            index = faiss.index_factory(
+                self.dimension, f"IVF{self.nlist},PQ{self.pq_m}x4fs", self.metric
+            )
+        elif self.index_type == "ivfpq":
+            # IVF with product quantization: 8-bit codes per sub-vector
+            quantizer = faiss.IndexFlat(self.dimension, self.metric)
+            index = faiss.IndexIVFPQ(quantizer, self.dimension, self.nlist, self.pq_m, 8, self.metric)
+        else:
+            return faiss.IndexFlat(self.dimension, self.metric)
+        
+        # Set search parameters
+        index.nprobe = min(self.nprobe, self.nlist)
+        return index
+    
+    def _create_new_index(self):
+        """Create a new FAISS index of the configured type"""
+        if self.needs_training:
+            # IVF / SQ quantizers need training data, so the index starts as an
+            # exact flat index and is promoted once train_size vectors exist
+            base_index = faiss.IndexFlat(self.dimension, self.metric)
             self.index_trained = False
             
-            logger.info(f"Created IVF index with nlist={self.nlist}, nprobe={self.nprobe}")
+            logger.info(
+                f"Created warm-up flat index; {self.index_type} is built after "
+                f"{self.train_size} vectors"
+            )
         else:
-            # Use IndexFlatL2 for exact L2 distance search (smaller datasets)
-            self.index = faiss.IndexFlatL2(self.dimension)
+            base_index = self._build_index()
             self.index_trained = True
-            logger.info("Created flat L2 index for exact search")
+            logger.info(f"Created {self.index_type} index")
         
-        # Add index ID tracking
-        self.index = faiss.IndexIDMap(self.index)
+        self.index = self._wrap_index(base_index)
         
-        self.index_to_application_id = {}
+        self.index_to_application_id = []
         self.application_id_to_index = {}
         self.next_index_id = 0
+        self._vectors = np.zeros((0, self.dimension), dtype=np.float16)
         
         # Save empty index
         self._save_index()
@@ -85,21 +438,38 @@ class VectorIndexService:
         """Load existing FAISS index and mapping from disk"""
         try:
             # Load FAISS index
-            self.index = faiss.read_index(str(self.index_file))
+            self.index = self._read_index_file()
             
-            # Check if index is trained (for IVF indexes)
-            self.index_trained = self.index.is_trained if hasattr(self.index, 'is_trained') else True
+            # Keep the metric the index was built with (legacy indexes are L2)
+            self.metric = self.index.metric_type
             
-            # Load mapping
-            with open(self.mapping_file, 'r') as f:
-                mapping_data = json.load(f)
-                
-                # Convert string keys back to integers for index_to_application_id
-                self.index_to_application_id = {
-                    int(k): v for k, v in mapping_data["index_to_application_id"].items()
-                }
-                self.application_id_to_index = mapping_data["application_id_to_index"]
-                self.next_index_id = mapping_data["next_index_id"]
+            # Still on the warm-up flat index if a trained type is configured
+            base_index = self._base_index()
+            self.index_trained = not (self.needs_training and isinstance(base_index, faiss.IndexFlat))
+            self._read_only = self.use_mmap and isinstance(base_index, faiss.IndexIVF)
+            
+            # Load mapping: newline-separated application IDs, one per index ID
+            if self.mapping_file.exists():
+                data = self.mapping_file.read_bytes()
+                application_ids = data.decode("utf-8").split("\n") if data else []
+                self.index_to_application_id = [a or None for a in application_ids]
+            else:
+                self._load_legacy_mapping()
+            
+            self.application_id_to_index = {
+                application_id: index_id
+                for index_id, application_id in enumerate(self.index_to_application_id)
+                if application_id is not None
+            }
+            self.next_index_id = len(self.index_to_application_id)
+            
+            if self.vectors_file.exists():
+                self._vectors = np.load(self.vectors_file)
+            else:
+                self._rebuild_vector_cache()
+            
+            if isinstance(self.index, faiss.IndexIDMap) and isinstance(base_index, faiss.IndexIVF):
+                self._unwrap_ivf_index()
             
             logger.info(f"Loaded index with {self.index.ntotal} vectors (trained: {self.index_trained})")
             
@@ -108,21 +478,137 @@ class VectorIndexService:
             logger.info("Creating new index instead")
             self._create_new_index()
     
+    def _read_index_file(self) -> faiss.Index:
+        """Read the snapshot, memory-mapped when enabled and supported"""
+        if self.use_mmap:
+            try:
+                return faiss.read_index(str(self.index_file), faiss.IO_FLAG_MMAP)
+            except RuntimeError as e:
+                # e.g. index types or filesystems without mmap support
+                logger.warning(f"Memory-mapping the index failed, reading it into memory: {str(e)}")
+                self.use_mmap = False
+        
+        return faiss.read_index(str(self.index_file))
+    
+    @staticmethod
+    def _wrap_index(base_index: faiss.Index) -> faiss.Index:
+        """Attach index ID tracking to a freshly built index"""
+        # IVF inverted lists store arbitrary 64-bit IDs themselves, and an ID
+        # map over IVF breaks on remove_ids (it assumes removal renumbers the
+        # remaining vectors, which IVF does not); other types get an
+        # IndexIDMap2, which also keeps the reverse map
+        if isinstance(base_index, faiss.IndexIVF):
+            return base_index
+        return faiss.IndexIDMap2(base_index)
+    
+    def _base_index(self) -> faiss.Index:
+        """The index holding the vectors, without any ID map wrapper"""
+        if isinstance(self.index, faiss.IndexIDMap):
+            return faiss.downcast_index(self.index.index)
+        return self.index
+    
+    def _unwrap_ivf_index(self):
+        """Move index IDs from an ID map into the IVF lists (snapshots written before IVF held them)"""
+        self._ensure_writable()
+        base_index = faiss.downcast_index(self.index.index)
+        
+        # Internal IDs are insertion positions; id_map holds their index IDs
+        base_index.make_direct_map()
+        vectors = base_index.reconstruct_n(0, self.index.ntotal)
+        ids = faiss.vector_to_array(self.index.id_map)
+        base_index.make_direct_map(False)
+        
+        base_index.reset()
+        base_index.add_with_ids(vectors, ids)
+        
+        # Take ownership of the IVF index before the ID map is freed
+        self.index.own_fields = False
+        base_index.this.own(True)
+        self.index = base_index
+        self._save_index()
+        logger.info(f"Converted ID-mapped IVF index with {len(ids)} vectors")
+    
+    def _rebuild_vector_cache(self):
+        """Fill the float16 vector cache from the index (snapshots written before it existed)"""
+        if isinstance(self.index, faiss.IndexIDMap):
+            base_index = faiss.downcast_index(self.index.index)
+            if isinstance(base_index, faiss.IndexIVF):
+                base_index.make_direct_map()
+            
+            # The ID map assigns internal IDs in insertion order; id_map holds their index IDs
+            vectors = base_index.reconstruct_n(0, self.index.ntotal)
+            ids = faiss.vector_to_array(self.index.id_map)
+        else:
+            # Fast-scan codes are stored interleaved in blocks and cannot be
+            # reconstructed reliably; their snapshots always carry the cache
+            if isinstance(self.index, faiss.IndexIVFFastScan):
+                raise RuntimeError(f"Vector cache missing: {self.vectors_file}")
+            
+            # IVF holding index IDs directly: look them up through a hash table
+            self._ensure_writable()
+            self.index.set_direct_map_type(faiss.DirectMap.Hashtable)
+            ids = np.array(
+                [i for i, a in enumerate(self.index_to_application_id) if a is not None],
+                dtype=np.int64
+            )
+            vectors = self.index.reconstruct_batch(ids)
+            self.index.set_direct_map_type(faiss.DirectMap.NoMap)
+        
+        self._vectors = np.zeros((self.next_index_id, self.dimension), dtype=np.float16)
+        self._vectors[ids] = vectors
+        logger.info(f"Rebuilt vector cache for {len(ids)} vectors")
+    
+    def _store_vectors(self, index_ids: np.ndarray, vectors: np.ndarray):
+        """Copy normalized vectors into the float16 cache, growing it geometrically"""
+        needed = int(index_ids.max()) + 1
+        if needed > len(self._vectors):
+            grown = np.zeros(
+                (max(needed, 2 * len(self._vectors), 1024), self.dimension), dtype=np.float16
+            )
+            grown[:len(self._vectors)] = self._vectors
+            self._vectors = grown
+        self._vectors[index_ids] = vectors
+    
+    def _load_legacy_mapping(self):
+        """Read the forward map from the JSON mapping written by older versions"""
+        mapping_data = orjson.loads(self.legacy_mapping_file.read_bytes())
+        
+        forward = [None] * mapping_data["next_index_id"]
+        for index_id, application_id in mapping_data["index_to_application_id"].items():
+            forward[int(index_id)] = application_id
+        self.index_to_application_id = forward
+    
     def _save_index(self):
         """Save FAISS index and mapping to disk"""
         try:
-            # Save FAISS index
-            faiss.write_index(self.index, str(self.index_file))
-            
-            # Save mapping
-            mapping_data = {
-                "index_to_application_id": self.index_to_application_id,
-                "application_id_to_index": self.application_id_to_index,
-                "next_index_id": self.next_index_id
-            }
+            # Every file is written to a temporary sibling and fsynced before
+            # any is swapped in with os.replace: a crash never leaves a torn
+            # file, and readers that memory-mapped the previous snapshot keep
+            # a valid one
+            tmp_index_file = self.index_file.with_suffix(".index.tmp")
+            faiss.write_index(self.index, str(tmp_index_file))
             
-            with open(self.mapping_file, 'w') as f:
-                json.dump(mapping_data, f, indent=2)
+            # Vector cache (only rows that have been assigned)
+            tmp_vectors_file = self.vectors_file.with_suffix(".npy.tmp")
+            with open(tmp_vectors_file, "wb") as f:
+                np.save(f, self._vectors[:self.next_index_id])
+            
+            # Mapping (forward map only; empty lines are removed entries)
+            tmp_mapping_file = self.mapping_file.with_suffix(".bin.tmp")
+            tmp_mapping_file.write_bytes(
+                "\n".join(a or "" for a in self.index_to_application_id).encode("utf-8")
+            )
+            
+            replacements = [
+                (tmp_index_file, self.index_file),
+                (tmp_vectors_file, self.vectors_file),
+                (tmp_mapping_file, self.mapping_file),
+            ]
+            for tmp_file, _ in replacements:
+                with open(tmp_file, "rb") as f:
+                    os.fsync(f.fileno())
+            for tmp_file, target in replacements:
+                os.replace(tmp_file, target)
             
             logger.info(f"Saved index with {self.index.ntotal} vectors to {self.index_file}")
             
@@ -130,21 +616,200 @@ class VectorIndexService:
             logger.error(f"Failed to save index: {str(e)}")
             raise
     
-    def _train_index_if_needed(self, embeddings: np.ndarray):
-        """Train IVF index if not yet trained and we have enough data"""
-        if self.use_ivf and not self.index_trained:
-            # Need at least nlist vectors to train
-            if embeddings.shape[0] >= self.nlist:
-                logger.info(f"Training IVF index with {embeddings.shape[0]} vectors...")
-                # Get the underlying index (unwrap IndexIDMap)
-                if isinstance(self.index, faiss.IndexIDMap):
-                    self.index.index.train(embeddings)
-                else:
-                    self.index.train(embeddings)
-                self.index_trained = True
-                logger.info("IVF index training completed")
+    def _replay_wal(self):
+        """Re-apply additions and removals logged after the last snapshot"""
+        if not self.wal_file.exists():
+            return
+        
+        data = self.wal_file.read_bytes()
+        header_size = _WAL_HEADER.size
+        vector_size = self.dimension * 4
+        
+        # Consecutive additions are re-added in one batch
+        pending_ids, pending_index_ids, pending_vectors = [], [], []
+        
+        def apply_pending():
+            if pending_ids:
+                self._apply_additions(
+                    pending_ids,
+                    np.array(pending_index_ids, dtype=np.int64),
+                    np.vstack(pending_vectors)
+                )
+                pending_ids.clear()
+                pending_index_ids.clear()
+                pending_vectors.clear()
+        
+        offset = 0
+        records = 0
+        while offset + header_size <= len(data):
+            op, index_id, id_length = _WAL_HEADER.unpack_from(data, offset)
+            id_start = offset + header_size
+            end = id_start + id_length + (vector_size if op == _WAL_ADD else 0)
+            if end > len(data):
+                break
+            
+            application_id = data[id_start:id_start + id_length].decode("utf-8")
+            
+            # Records already captured by the snapshot (a crash between writing
+            # the snapshot and truncating the log) are skipped
+            if op == _WAL_ADD:
+                if self.get_application_id(index_id) != application_id:
+                    pending_ids.append(application_id)
+                    pending_index_ids.append(index_id)
+                    pending_vectors.append(np.frombuffer(
+                        data, dtype=np.float32, count=self.dimension, offset=id_start + id_length
+                    ))
             else:
-                logger.warning(f"Not enough vectors to train IVF index ({embeddings.shape[0]} < {self.nlist})")
+                apply_pending()
+                if self.application_id_to_index.get(application_id) == index_id:
+                    self._apply_removals([application_id], [index_id])
+            
+            records += 1
+            offset = end
+        
+        apply_pending()
+        
+        if offset < len(data):
+            # Partial record from an interrupted write
+            logger.warning(f"Discarding {len(data) - offset} bytes of truncated write-ahead log")
+            with open(self.wal_file, "r+b") as f:
+                f.truncate(offset)
+        
+        self._wal_records = records
+        if records:
+            logger.info(f"Replayed {records} write-ahead log records")
+    
+    def _append_wal(self, payload: bytes, records: int):
+        """Durably append records to the write-ahead log"""
+        self._wal.write(payload)
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+        
+        self._wal_records += records
+    
+    def _checkpoint_if_due(self):
+        """Wake the checkpoint thread once CHECKPOINT_EVERY records are logged"""
+        # Called after the logged changes are applied: a snapshot taken
+        # between logging and applying would miss them and truncate their log.
+        # The snapshot is written off the request path; repeated wake-ups
+        # before it runs coalesce into one checkpoint
+        if self._wal_records >= self.CHECKPOINT_EVERY:
+            self._checkpoint_due.set()
+    
+    def _log_additions(self, application_ids: List[str], index_ids: np.ndarray, vectors: np.ndarray):
+        """Log additions (normalized vectors) to the write-ahead log"""
+        parts = []
+        for application_id, index_id, vector in zip(application_ids, index_ids.tolist(), vectors):
+            encoded = application_id.encode("utf-8")
+            parts.append(_WAL_HEADER.pack(_WAL_ADD, index_id, len(encoded)))
+            parts.append(encoded)
+            parts.append(vector.tobytes())
+        self._append_wal(b"".join(parts), len(application_ids))
+    
+    def _log_removals(self, application_ids: List[str], index_ids: List[int]):
+        """Log removals to the write-ahead log"""
+        parts = []
+        for application_id, index_id in zip(application_ids, index_ids):
+            encoded = application_id.encode("utf-8")
+            parts.append(_WAL_HEADER.pack(_WAL_REMOVE, index_id, len(encoded)))
+            parts.append(encoded)
+        self._append_wal(b"".join(parts), len(application_ids))
+    
+    def _apply_additions(self, application_ids: List[str], index_ids: np.ndarray, vectors: np.ndarray):
+        """Add normalized vectors to the index and update the mappings"""
+        with self._index_lock.write():
+            self._ensure_writable()
+            self.index.add_with_ids(vectors, index_ids)
+            
+            forward = self.index_to_application_id
+            for application_id, index_id in zip(application_ids, index_ids.tolist()):
+                if index_id >= len(forward):
+                    forward.extend([None] * (index_id + 1 - len(forward)))
+                forward[index_id] = application_id
+                self.application_id_to_index[application_id] = index_id
+            self.next_index_id = len(forward)
+            self._store_vectors(index_ids, vectors)
+            self._gpu_dirty = True
+            
+            # Train the index if it has enough data (for IVF)
+            self._promote_index_if_ready()
+    
+    def _apply_removals(self, application_ids: List[str], index_ids: List[int]):
+        """Evict applications' vectors from the index and drop them from the mappings"""
+        # HNSW graphs cannot delete nodes: the vector stays in the graph and
+        # is skipped in results because its ID no longer maps to an application
+        with self._index_lock.write():
+            if not isinstance(self._base_index(), faiss.IndexHNSW):
+                self._ensure_writable()
+                # One selector for the whole set, so N removals cost a single pass
+                self.index.remove_ids(faiss.IDSelectorBatch(np.array(index_ids, dtype=np.int64)))
+                self._gpu_dirty = True
+            
+            for application_id, index_id in zip(application_ids, index_ids):
+                del self.application_id_to_index[application_id]
+                self.index_to_application_id[index_id] = None
+    
+    def _ensure_writable(self):
+        """Read a memory-mapped IVF index into memory before modifying it"""
+        if self._read_only:
+            # Memory-mapped IVF lists cannot change
+            self.index = faiss.read_index(str(self.index_file))
+            self._read_only = False
+            logger.info("Loaded memory-mapped index into memory for writing")
+    
+    def checkpoint(self):
+        """Snapshot the index to disk and truncate the write-ahead log"""
+        with self._lock:
+            if self._wal_records == 0:
+                return
+            
+            self._save_index()
+            
+            self._wal.truncate(0)
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+            self._wal_records = 0
+    
+    def _run_checkpoints(self):
+        """Background loop checkpointing the index while it has unsaved changes"""
+        while True:
+            self._checkpoint_due.wait(self.CHECKPOINT_INTERVAL)
+            if self._checkpoint_stop.is_set():
+                return
+            self._checkpoint_due.clear()
+            try:
+                self.checkpoint()
+            except Exception as e:
+                logger.error(f"Index checkpoint failed: {str(e)}")
+    
+    def close(self):
+        """Stop background checkpoints and write a final snapshot"""
+        self._checkpoint_stop.set()
+        self._checkpoint_due.set()
+        self._checkpoint_thread.join()
+        self.checkpoint()
+        self._wal.close()
+    
+    def _promote_index_if_ready(self):
+        """Swap the warm-up flat index for the trained configured index"""
+        if self.index_trained or self.index.ntotal < self.train_size:
+            return
+        
+        logger.info(f"Training {self.index_type} index with {self.index.ntotal} vectors...")
+        
+        # The flat index stores vectors in insertion order; id_map holds their IDs
+        vectors = faiss.downcast_index(self.index.index).reconstruct_n(0, self.index.ntotal)
+        ids = faiss.vector_to_array(self.index.id_map)
+        
+        trained_index = self._build_index()
+        trained_index.train(vectors)
+        
+        promoted = self._wrap_index(trained_index)
+        promoted.add_with_ids(vectors, ids)
+        
+        self.index = promoted
+        self.index_trained = True
+        logger.info(f"{self.index_type} index training completed")
     
     def add_embedding(self, application_id: str, embedding: np.ndarray) -> int:
         """
@@ -160,10 +825,6 @@ class VectorIndexService:
         Raises:
             ValueError: If application_id already exists or embedding dimension is incorrect
         """
-        # Check if application already exists
-        if application_id in self.application_id_to_index:
-            raise ValueError(f"Application {application_id} already exists in index")
-        
         # Validate embedding dimension
         if embedding.shape[0] != self.dimension:
             raise ValueError(f"Embedding dimension {embedding.shape[0]} does not match expected {self.dimension}")
@@ -172,26 +833,108 @@ class VectorIndexService:
         if embedding.ndim == 1:
             embedding = embedding.reshape(1, -1)
         
-        # Ensure float32 type
-        embedding = embedding.astype(np.float32)
+        # Exactly one C-contiguous float32 copy: normalize_L2 works in place
+        # and must never touch the caller's array
+        embedding = np.array(embedding, dtype=np.float32, order="C")
+        faiss.normalize_L2(embedding)
         
-        # Assign index ID
-        index_id = self.next_index_id
+        with self._lock:
+            # Check if application already exists
+            if application_id in self.application_id_to_index:
+                raise ValueError(f"Application {application_id} already exists in index")
+            
+            # Assign index ID
+            index_id = self.next_index_id
+            index_ids = np.array([index_id], dtype=np.int64)
+            
+            # Log first, then add to FAISS index (no full index rewrite)
+            self._log_additions([application_id], index_ids, embedding)
+            self._apply_additions([application_id], index_ids, embedding)
+            self._checkpoint_if_due()
         
-        # Add to FAISS index
-        self.index.add_with_ids(embedding, np.array([index_id], dtype=np.int64))
+        logger.info(f"Added embedding for application {application_id} with index ID {index_id}")
         
-        # Update mappings
-        self.index_to_application_id[index_id] = application_id
-        self.application_id_to_index[application_id] = index_id
-        self.next_index_id += 1
+        return index_id
+    
+    async def add_embedding_async(self, application_id: str, embedding: np.ndarray) -> int:
+        """
+        Add a single embedding, coalesced with concurrent enrollments into one batch insert
         
-        # Save index to disk
-        self._save_index()
+        Args:
+            application_id: Unique application identifier
+            embedding: 512-dimensional embedding vector
+            
+        Returns:
+            Index ID assigned to the embedding
+            
+        Raises:
+            ValueError: If application_id already exists or embedding dimension is incorrect
+        """
+        embedding = embedding.reshape(-1)
+        if embedding.shape[0] != self.dimension:
+            raise ValueError(f"Embedding dimension {embedding.shape[0]} does not match expected {self.dimension}")
         
-        logger.info(f"Added embedding for application {application_id} with index ID {index_id}")
+        future: Future = Future()
+        with self._pending_ready:
+            self._pending.append((application_id, embedding, future))
+            self._pending_ready.notify()
         
-        return index_id
+        return await asyncio.wrap_future(future)
+    
+    def _run_batcher(self, pending: list, ready: threading.Condition,
+                     batch_size: int, window: float, handler):
+        """Background loop handing queued requests to handler in batches"""
+        while True:
+            with ready:
+                while not pending:
+                    ready.wait()
+                
+                # Give concurrent requests a short window to join the batch
+                deadline = time.monotonic() + window
+                while len(pending) < batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    ready.wait(remaining)
+                
+                batch = pending[:batch_size]
+                del pending[:batch_size]
+            
+            handler(batch)
+    
+    def _add_pending_batch(self, batch: List[Tuple[str, np.ndarray, Future]]):
+        """Insert a drained batch and resolve each caller's future"""
+        accepted = []
+        try:
+            with self._lock:
+                # Duplicates are rejected per caller, as add_embedding does
+                seen = set()
+                for application_id, embedding, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    if application_id in self.application_id_to_index or application_id in seen:
+                        future.set_exception(
+                            ValueError(f"Application {application_id} already exists in index")
+                        )
+                        continue
+                    seen.add(application_id)
+                    accepted.append((application_id, embedding, future))
+                
+                if not accepted:
+                    return
+                
+                index_ids = self.add_embeddings_batch(
+                    [(application_id, embedding) for application_id, embedding, _ in accepted]
+                )
+            
+            for (_, _, future), index_id in zip(accepted, index_ids):
+                future.set_result(index_id)
+                
+        except Exception as e:
+            logger.error(f"Batched embedding insert failed: {str(e)}")
+            for _, _, future in accepted:
+                if not future.done():
+                    future.set_exception(e)
     
     def add_embeddings_batch(self, embeddings_data: List[Tuple[str, np.ndarray]]) -> List[int]:
         """
@@ -206,57 +949,68 @@ class VectorIndexService:
         if not embeddings_data:
             return []
         
-        index_ids = []
-        embeddings_array = []
-        
-        for application_id, embedding in embeddings_data:
-            # Check if application already exists
-            if application_id in self.application_id_to_index:
-                logger.warning(f"Skipping duplicate application {application_id}")
-                continue
-            
-            # Validate embedding dimension
-            if embedding.shape[0] != self.dimension:
-                logger.warning(f"Skipping embedding with incorrect dimension: {embedding.shape[0]}")
-                continue
-            
-            # Assign index ID
-            index_id = self.next_index_id
-            index_ids.append(index_id)
+        with self._lock:
+            application_ids = []
+            embeddings_array = []
+            seen = set()
             
-            # Update mappings
-            self.index_to_application_id[index_id] = application_id
-            self.application_id_to_index[application_id] = index_id
-            self.next_index_id += 1
+            for application_id, embedding in embeddings_data:
+                # Check if application already exists (in the index or earlier in this batch)
+                if application_id in self.application_id_to_index or application_id in seen:
+                    logger.warning(f"Skipping duplicate application {application_id}")
+                    continue
+                
+                # Validate embedding dimension
+                if embedding.shape[0] != self.dimension:
+                    logger.warning(f"Skipping embedding with incorrect dimension: {embedding.shape[0]}")
+                    continue
+                
+                seen.add(application_id)
+                application_ids.append(application_id)
+                embeddings_array.append(embedding)
             
-            # Collect embedding
-            embeddings_array.append(embedding)
-        
-        if embeddings_array:
-            # Convert to numpy array
-            embeddings_np = np.array(embeddings_array, dtype=np.float32)
-            index_ids_np = np.array(index_ids, dtype=np.int64)
+            if not embeddings_array:
+                return []
             
-            # Train index if needed (for IVF)
-            self._train_index_if_needed(embeddings_np)
+            # Assign index IDs
+            index_ids_np = np.arange(
+                self.next_index_id, self.next_index_id + len(application_ids), dtype=np.int64
+            )
             
-            # Add to FAISS index
-            self.index.add_with_ids(embeddings_np, index_ids_np)
+            # Stack rows straight into the reusable C-contiguous float32
+            # buffer (cast on copy), normalized in place for FAISS
+            if len(embeddings_array) > len(self._add_buffer):
+                self._add_buffer = np.empty((len(embeddings_array), self.dimension), dtype=np.float32)
+            embeddings_np = self._add_buffer[:len(embeddings_array)]
+            np.stack(embeddings_array, out=embeddings_np)
+            faiss.normalize_L2(embeddings_np)
             
-            # Save index to disk
-            self._save_index()
-            
-            logger.info(f"Added {len(embeddings_array)} embeddings in batch")
+            # Log first, then add to FAISS index (no full index rewrite)
+            self._log_additions(application_ids, index_ids_np, embeddings_np)
+            self._apply_additions(application_ids, index_ids_np, embeddings_np)
+            self._checkpoint_if_due()
+        
+        logger.info(f"Added {len(embeddings_array)} embeddings in batch")
         
-        return index_ids
+        return index_ids_np.tolist()
     
     def get_index_size(self) -> int:
-        """Get the number of vectors in the index"""
-        return self.index.ntotal
+        """Get the number of live vectors in the index (removed HNSW nodes excluded)"""
+        return len(self.application_id_to_index)
     
     def get_application_id(self, index_id: int) -> Optional[str]:
         """Get application ID for a given index ID"""
-        return self.index_to_application_id.get(index_id)
+        if 0 <= index_id < len(self.index_to_application_id):
+            return self.index_to_application_id[index_id]
+        return None
+    
+    def get_embedding(self, application_id: str) -> Optional[np.ndarray]:
+        """Get the stored (normalized) embedding for an application as float32"""
+        with self._index_lock.read():
+            index_id = self.application_id_to_index.get(application_id)
+            if index_id is None:
+                return None
+            return self._vectors[index_id].astype(np.float32)
     
     def get_index_id(self, application_id: str) -> Optional[int]:
         """Get index ID for a given application ID"""
@@ -266,7 +1020,8 @@ class VectorIndexService:
         """
         Remove an embedding from the index
         
-        Note: FAISS IndexIDMap doesn't support removal, so this requires rebuilding the index
+        Note: the vector is evicted with remove_ids (O(N) for flat indexes,
+        O(list size) for IVF); HNSW indexes only drop the mapping
         
         Args:
             application_id: Application identifier to remove
@@ -274,28 +1029,54 @@ class VectorIndexService:
         Returns:
             True if removed successfully, False otherwise
         """
-        if application_id not in self.application_id_to_index:
-            logger.warning(f"Application {application_id} not found in index")
-            return False
-        
-        # Get index ID
-        index_id = self.application_id_to_index[application_id]
+        with self._lock:
+            if application_id not in self.application_id_to_index:
+                logger.warning(f"Application {application_id} not found in index")
+                return False
+            
+            # Get index ID
+            index_id = self.application_id_to_index[application_id]
+            
+            # Log first, then evict from FAISS and the mappings
+            self._log_removals([application_id], [index_id])
+            self._apply_removals([application_id], [index_id])
+            self._checkpoint_if_due()
         
-        # Remove from mappings
-        del self.application_id_to_index[application_id]
-        del self.index_to_application_id[index_id]
+        logger.info(f"Removed embedding for application {application_id}")
         
-        # Rebuild index without this embedding
-        # This is expensive but necessary for FAISS
-        logger.warning("Removing embedding requires index rebuild - this is an expensive operation")
+        return True
+    
+    def remove_embeddings_batch(self, application_ids: List[str]) -> int:
+        """
+        Remove multiple embeddings from the index in batch
         
-        # For now, just update mappings and mark as removed
-        # Full rebuild can be done during maintenance
-        self._save_index()
+        Args:
+            application_ids: Application identifiers to remove
+            
+        Returns:
+            Number of embeddings removed (unknown IDs are skipped)
+        """
+        with self._lock:
+            removed_ids = []
+            index_ids = []
+            for application_id in dict.fromkeys(application_ids):
+                index_id = self.application_id_to_index.get(application_id)
+                if index_id is None:
+                    logger.warning(f"Application {application_id} not found in index")
+                    continue
+                removed_ids.append(application_id)
+                index_ids.append(index_id)
+            
+            if not removed_ids:
+                return 0
+            
+            self._log_removals(removed_ids, index_ids)
+            self._apply_removals(removed_ids, index_ids)
+            self._checkpoint_if_due()
         
-        logger.info(f"Removed embedding for application {application_id}")
+        logger.info(f"Removed {len(removed_ids)} embeddings in batch")
         
-        return True
+        return len(removed_ids)
     
     def search_similar(self, query_embedding: np.ndarray, k: int = 10, 
                       threshold: Optional[float] = None) -> List[Dict[str, Any]]:
@@ -310,44 +1091,121 @@ class VectorIndexService:
         Returns:
             List of matches with application_id and similarity score
         """
-        if self.index.ntotal == 0:
+        if not self.application_id_to_index:
             logger.warning("Index is empty, no results to return")
             return []
         
-        # Ensure embedding is 2D array for FAISS
-        if query_embedding.ndim == 1:
-            query_embedding = query_embedding.reshape(1, -1)
+        query_norm = self._normalize_query(query_embedding)
+        self._refresh_gpu_index()
+        
+        with self._index_lock.read():
+            if threshold is not None and self.index_type not in REFINED_INDEX_TYPES:
+                # Only vectors within the threshold radius come back from FAISS
+                distances, indices = self._range_search(query_norm, threshold, k)
+            else:
+                # Compressed codes are too coarse for a radius; re-rank, then filter
+                distances, indices = self._search_refined(query_norm, k)
+                distances, indices = distances[0], indices[0]
+            
+            return self._to_results(distances, indices, threshold)
+    
+    async def search_similar_async(self, query_embedding: np.ndarray, k: int = 10,
+                                   threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Search for similar embeddings, batched with concurrent queries into one index search
+        
+        Args:
+            query_embedding: Query embedding vector
+            k: Number of nearest neighbors to return
+            threshold: Optional similarity threshold (cosine similarity)
+            
+        Returns:
+            List of matches with application_id and similarity score
+        """
+        if threshold is not None:
+            # Range searches are answered per query
+            return self.search_similar(query_embedding, k=k, threshold=threshold)
         
-        # Ensure float32 type
-        query_embedding = query_embedding.astype(np.float32)
+        if not self.application_id_to_index:
+            logger.warning("Index is empty, no results to return")
+            return []
         
-        # Normalize for cosine similarity
-        query_norm = query_embedding / np.linalg.norm(query_embedding)
+        future: Future = Future()
+        with self._queries_ready:
+            self._pending_queries.append((self._normalize_query(query_embedding), k, future))
+            self._queries_ready.notify()
         
-        # Search index
-        distances, indices = self.index.search(query_norm, k)
+        return await asyncio.wrap_future(future)
+    
+    def _search_pending_batch(self, batch: List[Tuple[np.ndarray, int, Future]]):
+        """Answer a drained batch of queries with one index search"""
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
         
-        # Convert to results
-        results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx == -1:  # FAISS returns -1 for empty slots
-                continue
+        try:
+            queries = np.vstack([query for query, _, _ in batch])
+            self._refresh_gpu_index()
+            
+            with self._index_lock.read():
+                distances, indices = self._search_refined(queries, max(k for _, k, _ in batch))
+                results = [
+                    self._to_results(distances[row, :k], indices[row, :k])
+                    for row, (_, k, _) in enumerate(batch)
+                ]
             
+            for (_, _, future), matches in zip(batch, results):
+                future.set_result(matches)
+                
+        except Exception as e:
+            logger.error(f"Batched search failed: {str(e)}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    def _normalize_query(self, query_embedding: np.ndarray) -> np.ndarray:
+        """Shape a query as a normalized (1, d) float32 array"""
+        # Ensure embedding is 2D array for FAISS
+        if query_embedding.ndim == 1:
+            query_embedding = query_embedding.reshape(1, -1)
+        
+        # One C-contiguous float32 copy, normalized in place with FAISS's SIMD
+        # kernel (never touching the caller's array)
+        query_embedding = np.array(query_embedding, dtype=np.float32, order="C")
+        faiss.normalize_L2(query_embedding)
+        return query_embedding
+    
+    def _to_results(self, distances: np.ndarray, indices: np.ndarray,
+                    threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Convert one query's FAISS output into match dictionaries"""
+        scores = distances.astype(np.float64)
+        if self.metric == faiss.METRIC_INNER_PRODUCT:
+            # Inner product of normalized vectors is the cosine similarity;
+            # report the equivalent squared L2 distance as before
+            similarities = scores
+            scores = 2.0 * (1.0 - similarities)
+        else:
             # Convert L2 distance to cosine similarity
             # For normalized vectors: similarity = 1 - (distance^2 / 2)
-            similarity = 1.0 - (dist / 2.0)
-            similarity = max(0.0, min(1.0, float(similarity)))
-            
-            # Apply threshold if specified
-            if threshold is not None and similarity < threshold:
-                continue
-            
-            application_id = self.index_to_application_id.get(int(idx))
+            similarities = 1.0 - scores / 2.0
+        similarities = np.clip(similarities, 0.0, 1.0)
+        
+        # FAISS returns -1 for empty slots; apply threshold if specified
+        keep = indices != -1
+        if threshold is not None:
+            keep &= similarities >= threshold
+        
+        forward = self.index_to_application_id
+        results = []
+        for idx, similarity, dist in zip(indices[keep].tolist(),
+                                         similarities[keep].tolist(),
+                                         scores[keep].tolist()):
+            application_id = forward[idx] if idx < len(forward) else None
             if application_id:
                 results.append({
                     "application_id": application_id,
                     "similarity": similarity,
-                    "distance": float(dist)
+                    "distance": dist
                 })
         
         return results
@@ -365,14 +1223,11 @@ class VectorIndexService:
         Returns:
             List of matches (excluding the query application itself)
         """
-        # Get index ID
-        index_id = self.get_index_id(application_id)
-        if index_id is None:
+        # Stored embedding from the vector cache
+        embedding = self.get_embedding(application_id)
+        if embedding is None:
             raise ValueError(f"Application {application_id} not found in index")
         
-        # Reconstruct embedding
-        embedding = self.index.reconstruct(int(index_id))
-        
         # Search (k+1 to account for self-match)
         results = self.search_similar(embedding, k=k+1, threshold=threshold)
         
@@ -389,25 +1244,51 @@ class VectorIndexService:
             Dictionary with index statistics
         """
         stats = {
-            "total_vectors": self.index.ntotal,
+            "total_vectors": len(self.application_id_to_index),
+            "tombstones": self._tombstones(),
             "dimension": self.dimension,
             "next_index_id": self.next_index_id,
-            "index_type": type(self.index).__name__,
+            "index_type": self.index_type,
+            "gpu_enabled": self.use_gpu,
+            "mmap": self.use_mmap,
+            "omp_threads": self.omp_threads,
+            "faiss_build": self.faiss_build,
+            "faiss_index": type(self._base_index()).__name__,
             "index_file": str(self.index_file),
-            "mapping_file": str(self.mapping_file)
+            "mapping_file": str(self.mapping_file),
+            "vector_cache_bytes": self._vectors[:self.next_index_id].nbytes
         }
         
         # Add IVF-specific stats
-        if self.use_ivf:
+        if self.index_type in ("ivf", "ivfsq8", "ivfpq", "ivfpqfs"):
             stats.update({
                 "ivf_enabled": True,
                 "ivf_trained": self.index_trained,
+                "train_size": self.train_size,
                 "nlist": self.nlist,
                 "nprobe": self.nprobe
             })
+        elif self.index_type == "sq8":
+            stats.update({
+                "sq_trained": self.index_trained,
+                "train_size": self.train_size
+            })
+        elif self.index_type == "hnsw":
+            stats.update({
+                "hnsw_m": self.hnsw_m,
+                "ef_construction": self.hnsw_ef_construction,
+                "ef_search": self.hnsw_ef_search
+            })
+        
+        if self.index_type in REFINED_INDEX_TYPES:
+            stats["refine_factor"] = self.refine_factor
         
         return stats
 
 
-# Global vector index service instance
-vector_index_service = VectorIndexService()
+# Global vector index service instance, created (and loaded from disk) on
+# first use rather than at import, so processes that never search skip it
+@lru_cache(maxsize=1)
+def get_vector_index_service() -> VectorIndexService:
+    """Get the global vector index service"""
+    return VectorIndexService()
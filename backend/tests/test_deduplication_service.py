@@ -1,10 +1,13 @@
 """Integration tests for de-duplication service"""
 
+import asyncio
 import pytest
 import numpy as np
 from pathlib import Path
 import tempfile
 import shutil
+import threading
+import time
 
 from app.services.deduplication_service import (
     DeduplicationService,
@@ -243,6 +246,16 @@ class TestVectorIndexIntegration:
         assert results[0]["application_id"] == "app-001"
         assert results[0]["similarity"] >= 0.99
     
+    def test_search_by_application_id(self, vector_index_service, sample_embedding, similar_embedding):
+        """Test searching with an enrolled application's stored embedding"""
+        vector_index_service.add_embedding("app-001", sample_embedding)
+        vector_index_service.add_embedding("app-002", similar_embedding)
+        
+        results = vector_index_service.search_by_application_id("app-001", k=1)
+        
+        assert len(results) == 1
+        assert results[0]["application_id"] == "app-002"
+    
     def test_batch_embedding_insertion(self, vector_index_service):
         """Test batch insertion of embeddings"""
         # Create multiple embeddings
@@ -258,6 +271,138 @@ class TestVectorIndexIntegration:
         assert len(index_ids) == 5
         assert vector_index_service.get_index_size() == 5
     
+    def test_concurrent_searches_batched(self, vector_index_service):
+        """Test that concurrent async searches each get their own results"""
+        embeddings = np.random.randn(4, 512).astype(np.float32)
+        vector_index_service.add_embeddings_batch(
+            [(f"app-{i:03d}", embeddings[i]) for i in range(4)]
+        )
+        
+        async def search():
+            return await asyncio.gather(
+                *(vector_index_service.search_similar_async(embeddings[i], k=i + 1) for i in range(4))
+            )
+        
+        results = asyncio.run(search())
+        
+        assert [len(r) for r in results] == [1, 2, 3, 4]
+        assert [r[0]["application_id"] for r in results] == [f"app-{i:03d}" for i in range(4)]
+    
+    def test_concurrent_adds_coalesced(self, vector_index_service):
+        """Test that concurrent async adds are inserted as one batch"""
+        embeddings = np.random.randn(4, 512).astype(np.float32)
+        
+        async def enroll():
+            return await asyncio.gather(
+                *(vector_index_service.add_embedding_async(f"app-{i:03d}", embeddings[i]) for i in range(4)),
+                vector_index_service.add_embedding_async("app-000", embeddings[0]),
+                return_exceptions=True
+            )
+        
+        results = asyncio.run(enroll())
+        
+        assert results[:4] == [0, 1, 2, 3]
+        assert isinstance(results[4], ValueError)
+        assert vector_index_service.get_index_size() == 4
+    
+    def test_search_while_index_is_modified(self, vector_index_service):
+        """Test that searches running alongside adds and removes see a consistent index"""
+        embeddings = np.random.randn(400, 512).astype(np.float32)
+        vector_index_service.add_embedding("app-anchor", embeddings[0])
+        errors = []
+        
+        def mutate():
+            try:
+                for i in range(1, 400):
+                    vector_index_service.add_embedding(f"app-{i:03d}", embeddings[i])
+                    if i % 3 == 0:
+                        vector_index_service.remove_embedding(f"app-{i:03d}")
+            except Exception as e:
+                errors.append(e)
+        
+        writer = threading.Thread(target=mutate)
+        writer.start()
+        while writer.is_alive():
+            results = vector_index_service.search_similar(embeddings[0], k=5)
+            assert results[0]["application_id"] == "app-anchor"
+        writer.join()
+        
+        assert errors == []
+        assert vector_index_service.get_index_size() == 400 - 133
+    
+    def test_search_waits_for_index_mutation(self, vector_index_service, sample_embedding):
+        """Test that a search does not run while the index is being modified"""
+        vector_index_service.add_embedding("app-001", sample_embedding)
+        results = []
+        
+        with vector_index_service._index_lock.write():
+            searcher = threading.Thread(
+                target=lambda: results.append(vector_index_service.search_similar(sample_embedding, k=1))
+            )
+            searcher.start()
+            searcher.join(timeout=0.1)
+            assert searcher.is_alive()
+        
+        searcher.join(timeout=5)
+        assert results[0][0]["application_id"] == "app-001"
+    
+    def test_batched_search_waits_for_index_mutation(self, vector_index_service, sample_embedding):
+        """Test that the search batcher does not query the index while it is being modified"""
+        vector_index_service.add_embedding("app-001", sample_embedding)
+        
+        async def search_during_write():
+            with vector_index_service._index_lock.write():
+                pending = asyncio.ensure_future(vector_index_service.search_similar_async(sample_embedding, k=1))
+                done, _ = await asyncio.wait([pending], timeout=0.1)
+                assert not done
+            return await asyncio.wait_for(pending, timeout=5)
+        
+        results = asyncio.run(search_during_write())
+        
+        assert results[0]["application_id"] == "app-001"
+    
+    def test_remove_embedding_evicts_vector(self, vector_index_service, sample_embedding):
+        """Test that removed embeddings are no longer searched"""
+        vector_index_service.add_embedding("app-001", sample_embedding)
+        
+        assert vector_index_service.remove_embedding("app-001") is True
+        assert vector_index_service.get_index_size() == 0
+        assert vector_index_service.search_similar(sample_embedding, k=1) == []
+    
+    def test_hnsw_remove_and_readd(self, temp_vector_storage, monkeypatch):
+        """Test that removed HNSW nodes neither count nor take result slots"""
+        monkeypatch.setattr(settings, "FAISS_INDEX_TYPE", "hnsw")
+        service = VectorIndexService()
+        
+        embeddings = np.random.randn(50, 512).astype(np.float32)
+        service.add_embeddings_batch([(f"app-{i:03d}", embeddings[i]) for i in range(50)])
+        
+        assert service.remove_embeddings_batch(["app-000", "app-001"]) == 2
+        assert service.get_index_size() == 48
+        assert service.get_stats()["total_vectors"] == 48
+        
+        # Same vector re-enrolled under a new ID must still be found
+        service.add_embedding("app-new", embeddings[1])
+        
+        assert service.search_similar(embeddings[1], k=1)[0]["application_id"] == "app-new"
+        assert service.search_similar(embeddings[1], k=1, threshold=0.9)[0]["application_id"] == "app-new"
+        matches = asyncio.run(service.search_similar_async(embeddings[0], k=3))
+        assert len(matches) == 3
+        assert all(m["application_id"] not in ("app-000", "app-001") for m in matches)
+    
+    def test_remove_embeddings_batch(self, vector_index_service):
+        """Test removing several embeddings at once, skipping unknown IDs"""
+        embeddings = np.random.randn(3, 512).astype(np.float32)
+        for i in range(3):
+            vector_index_service.add_embedding(f"app-{i:03d}", embeddings[i])
+        
+        removed = vector_index_service.remove_embeddings_batch(["app-000", "app-002", "app-999"])
+        
+        assert removed == 2
+        assert vector_index_service.get_index_size() == 1
+        results = vector_index_service.search_similar(embeddings[0], k=3)
+        assert [r["application_id"] for r in results] == ["app-001"]
+    
     def test_index_persistence(self, vector_index_service, sample_embedding, temp_vector_storage):
         """Test that index is persisted to disk"""
         # Add embedding
@@ -265,11 +410,76 @@ class TestVectorIndexIntegration:
         
         # Check that files exist
         index_file = Path(temp_vector_storage) / "faiss.index"
-        mapping_file = Path(temp_vector_storage) / "index_mapping.json"
+        mapping_file = Path(temp_vector_storage) / "index_ids.bin"
         
         assert index_file.exists()
         assert mapping_file.exists()
 
+    def test_unsaved_additions_recovered_from_log(self, vector_index_service, sample_embedding):
+        """Test that additions made since the last checkpoint survive a restart"""
+        vector_index_service.add_embedding("app-001", sample_embedding)
+        
+        # New service on the same directory, without a checkpoint in between
+        restarted = VectorIndexService()
+        
+        assert restarted.get_index_size() == 1
+        assert restarted.search_similar(sample_embedding, k=1)[0]["application_id"] == "app-001"
+
+    def test_checkpoint_written_in_background(self, vector_index_service, sample_embedding, monkeypatch):
+        """Test that reaching CHECKPOINT_EVERY snapshots the index off the request path"""
+        monkeypatch.setattr(vector_index_service, "CHECKPOINT_EVERY", 1)
+        vector_index_service.add_embedding("app-001", sample_embedding)
+        
+        # Give the checkpoint thread a moment to pick up the request
+        for _ in range(100):
+            if vector_index_service._wal_records == 0:
+                break
+            time.sleep(0.01)
+        
+        assert vector_index_service._wal_records == 0
+        assert vector_index_service.wal_file.stat().st_size == 0
+
+    def test_ivf_index_promoted_after_warmup(self, temp_vector_storage, monkeypatch):
+        """Test that an IVF index serves exact search until it can be trained"""
+        monkeypatch.setattr(settings, "FAISS_INDEX_TYPE", "ivf")
+        monkeypatch.setattr(settings, "FAISS_NLIST", 2)
+        service = VectorIndexService()
+
+        embeddings = np.random.randn(service.train_size, 512).astype(np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        # Single adds work before training (warm-up flat index)
+        service.add_embedding("app-000", embeddings[0])
+        assert service.index_trained is False
+        assert service.search_similar(embeddings[0], k=1)[0]["application_id"] == "app-000"
+
+        service.add_embeddings_batch([
+            (f"app-{i:03d}", embeddings[i]) for i in range(1, service.train_size)
+        ])
+
+        assert service.index_trained is True
+        assert service.get_index_size() == service.train_size
+        assert service.search_similar(embeddings[7], k=1)[0]["application_id"] == "app-007"
+
+    def test_ivf_remove_keeps_remaining_ids(self, temp_vector_storage, monkeypatch):
+        """Test that removals from a trained IVF index leave other IDs searchable"""
+        monkeypatch.setattr(settings, "FAISS_INDEX_TYPE", "ivf")
+        monkeypatch.setattr(settings, "FAISS_NLIST", 2)
+        service = VectorIndexService()
+
+        embeddings = np.random.randn(service.train_size, 512).astype(np.float32)
+        service.add_embeddings_batch([
+            (f"app-{i:03d}", embeddings[i]) for i in range(service.train_size)
+        ])
+
+        assert service.remove_embeddings_batch(["app-000", "app-001"]) == 2
+        assert service.get_index_size() == service.train_size - 2
+        assert service.search_similar(embeddings[7], k=1)[0]["application_id"] == "app-007"
+
+        restarted = VectorIndexService()
+        assert restarted.get_index_size() == service.train_size - 2
+        assert restarted.search_similar(embeddings[7], k=1)[0]["application_id"] == "app-007"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,5 +1,6 @@
 """Unit tests for identity management service"""
 
+import asyncio
 import pytest
 import uuid
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -320,5 +321,107 @@ class TestIdentityStatusManagement:
             assert is_valid is False
 
 
+class TestIdentityCache:
+    """Tests for identity lookup caching"""
+    
+    @pytest.mark.asyncio
+    async def test_get_identity_served_from_cache(self, identity_service, sample_identity):
+        """Test that repeated lookups hit the database only once"""
+        repo = MagicMock()
+        repo.get_by_unique_id = AsyncMock(return_value=sample_identity)
+        
+        with patch.object(identity_service, '_get_identity_repo', return_value=repo):
+            first = await identity_service.get_identity(None, sample_identity.unique_id)
+            second = await identity_service.get_identity(None, sample_identity.unique_id)
+        
+        assert first == second
+        repo.get_by_unique_id.assert_called_once_with(sample_identity.unique_id)
+    
+    @pytest.mark.asyncio
+    async def test_cached_identity_is_copied(self, identity_service, sample_identity):
+        """Test that modifying a returned identity does not change the cached one"""
+        repo = MagicMock()
+        repo.get_by_unique_id = AsyncMock(return_value=sample_identity)
+        
+        with patch.object(identity_service, '_get_identity_repo', return_value=repo):
+            first = await identity_service.get_identity(None, sample_identity.unique_id)
+            first.application_ids.append("app-999")
+            second = await identity_service.get_identity(None, sample_identity.unique_id)
+        
+        assert second.application_ids == ["app-001"]
+    
+    @pytest.mark.asyncio
+    async def test_write_during_lookup_is_not_cached(self, identity_service, sample_identity):
+        """Test that a fetch racing a write does not cache the stale identity"""
+        fetched = asyncio.Event()
+        release = asyncio.Event()
+        
+        async def slow_fetch(unique_id):
+            fetched.set()
+            await release.wait()
+            return sample_identity
+        
+        repo = MagicMock()
+        repo.get_by_unique_id = AsyncMock(side_effect=slow_fetch)
+        repo.update_status = AsyncMock(return_value=True)
+        
+        with patch.object(identity_service, '_get_identity_repo', return_value=repo):
+            lookup = asyncio.create_task(identity_service.get_identity(None, sample_identity.unique_id))
+            await fetched.wait()
+            await identity_service.update_identity_status(
+                None, sample_identity.unique_id, IdentityStatus.SUSPENDED
+            )
+            release.set()
+            await lookup
+            
+            await identity_service.get_identity(None, sample_identity.unique_id)
+        
+        assert repo.get_by_unique_id.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_status_update_invalidates_cache(self, identity_service, sample_identity):
+        """Test that writes drop the cached identity"""
+        repo = MagicMock()
+        repo.get_by_unique_id = AsyncMock(return_value=sample_identity)
+        repo.update_status = AsyncMock(return_value=True)
+        
+        with patch.object(identity_service, '_get_identity_repo', return_value=repo):
+            await identity_service.get_identity(None, sample_identity.unique_id)
+            await identity_service.update_identity_status(
+                None, sample_identity.unique_id, IdentityStatus.SUSPENDED
+            )
+            await identity_service.get_identity(None, sample_identity.unique_id)
+        
+        assert repo.get_by_unique_id.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_waiter_survives_cancelled_lookup(self, identity_service, sample_identity):
+        """Test that cancelling the fetching task does not strand concurrent callers"""
+        calls = 0
+        
+        async def slow_fetch(unique_id):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+            return sample_identity
+        
+        repo = MagicMock()
+        repo.get_by_unique_id = slow_fetch
+        
+        with patch.object(identity_service, '_get_identity_repo', return_value=repo):
+            owner = asyncio.create_task(identity_service.get_identity(None, sample_identity.unique_id))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(identity_service.get_identity(None, sample_identity.unique_id))
+            await asyncio.sleep(0.01)
+            
+            owner.cancel()
+            result = await asyncio.wait_for(waiter, timeout=1)
+        
+        assert result is sample_identity
+        assert owner.cancelled()
+        assert calls == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,210 @@
+"""Unit tests for metrics collection service"""
+
+import random
+import threading
+import pytest
+
+from app.services.metrics_service import MetricsService, MetricType
+
+
+@pytest.fixture
+def metrics():
+    """Create fresh metrics service instance"""
+    return MetricsService()
+
+
+class TestLatencyStats:
+    """Tests for latency statistics"""
+
+    def test_no_samples(self, metrics):
+        """Test that a metric type without samples reports zeros"""
+        stats = metrics.get_latency_stats(MetricType.FAISS_SEARCH)
+
+        assert stats["count"] == 0
+        assert stats["p95_ms"] == 0
+
+    def test_small_sample_is_exact(self, metrics):
+        """Test that percentiles of a handful of samples are interpolated exactly"""
+        for latency in [40.0, 10.0, 30.0, 20.0, 50.0]:
+            metrics.record_latency(MetricType.FACE_RECOGNITION, latency)
+
+        stats = metrics.get_latency_stats(MetricType.FACE_RECOGNITION)
+
+        assert stats["count"] == 5
+        assert stats["min_ms"] == 10.0
+        assert stats["max_ms"] == 50.0
+        assert stats["avg_ms"] == 30.0
+        assert stats["p50_ms"] == 30.0
+        assert stats["p95_ms"] == pytest.approx(48.0)
+
+    def test_percentiles_of_known_distribution(self, metrics):
+        """Test streaming percentiles against a uniform sample of 1..1000 ms"""
+        latencies = list(range(1, 1001))
+        random.Random(0).shuffle(latencies)
+        for latency in latencies:
+            metrics.record_latency(MetricType.API_REQUEST, float(latency))
+
+        stats = metrics.get_latency_stats(MetricType.API_REQUEST)
+
+        assert stats["count"] == 1000
+        assert stats["min_ms"] == 1.0
+        assert stats["max_ms"] == 1000.0
+        assert stats["avg_ms"] == pytest.approx(500.5)
+        assert stats["p50_ms"] == pytest.approx(500, rel=0.05)
+        assert stats["p95_ms"] == pytest.approx(950, rel=0.02)
+        assert stats["p99_ms"] == pytest.approx(990, rel=0.02)
+
+    def test_percentiles_exact_below_max_history(self, metrics):
+        """Test that a few dozen samples give exact percentiles, not marker estimates"""
+        for latency in range(1, 21):
+            metrics.record_latency(MetricType.FAISS_SEARCH, float(latency))
+
+        stats = metrics.get_latency_stats(MetricType.FAISS_SEARCH)
+
+        assert stats["p50_ms"] == pytest.approx(10.5)
+        assert stats["p95_ms"] == pytest.approx(19.05)
+        assert stats["p99_ms"] == pytest.approx(19.81)
+
+    def test_percentiles_stream_beyond_max_history(self):
+        """Test that percentiles stay accurate once samples exceed max_history"""
+        metrics = MetricsService(max_history=100)
+        latencies = list(range(1, 10001))
+        random.Random(1).shuffle(latencies)
+        for latency in latencies:
+            metrics.record_latency(MetricType.API_REQUEST, float(latency))
+
+        stats = metrics.get_latency_stats(MetricType.API_REQUEST)
+
+        assert stats["count"] == 10000
+        assert stats["min_ms"] == 1.0
+        assert stats["max_ms"] == 10000.0
+        assert stats["p50_ms"] == pytest.approx(5000, rel=0.02)
+        assert stats["p95_ms"] == pytest.approx(9500, rel=0.01)
+        assert stats["p99_ms"] == pytest.approx(9900, rel=0.01)
+
+
+class TestCounters:
+    """Tests for counters and buffered latency samples"""
+
+    def test_record_count(self, metrics):
+        """Test that counts accumulate per metric type"""
+        metrics.record_count(MetricType.APPLICATION_SUBMISSION)
+        metrics.record_count(MetricType.APPLICATION_SUBMISSION, 4)
+
+        assert metrics.get_counter(MetricType.APPLICATION_SUBMISSION) == 5
+        assert metrics.get_counter(MetricType.IDENTITY_ISSUANCE) == 0
+
+    def test_latencies_from_many_threads_are_counted(self, metrics):
+        """Test that samples buffered per thread are flushed before a read"""
+        # Keep the background flusher out of the way so the read has to flush
+        metrics.FLUSH_INTERVAL = 3600
+
+        def worker():
+            for _ in range(500):
+                metrics.record_latency(MetricType.DUPLICATE_DETECTION, 1.0)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert metrics.get_counter(MetricType.DUPLICATE_DETECTION) == 4000
+        assert metrics.get_latency_stats(MetricType.DUPLICATE_DETECTION)["count"] == 4000
+
+    def test_processing_rate_window_capped(self, metrics):
+        """Test that windows beyond the rate buckets are averaged over the buckets"""
+        for _ in range(6):
+            metrics.record_count(MetricType.APPLICATION_SUBMISSION)
+        longest = metrics.RATE_WINDOW_SECONDS
+
+        assert metrics.get_processing_rate(MetricType.APPLICATION_SUBMISSION, 10) == pytest.approx(0.6)
+        assert metrics.get_processing_rate(MetricType.APPLICATION_SUBMISSION, longest) == pytest.approx(6 / longest)
+        assert metrics.get_processing_rate(MetricType.APPLICATION_SUBMISSION, 600) == pytest.approx(6 / longest)
+
+
+class TestErrors:
+    """Tests for error tracking"""
+
+    def test_error_rate(self, metrics):
+        """Test that the error rate is errors over all recent events"""
+        assert metrics.get_error_rate() == 0.0
+
+        for _ in range(3):
+            metrics.record_count(MetricType.APPLICATION_SUBMISSION)
+        metrics.record_error(MetricType.FACE_RECOGNITION, "no face detected")
+
+        # 3 submissions plus the error event itself
+        assert metrics.get_error_rate() == pytest.approx(25.0)
+        assert metrics.errors["face_recognition_error"] == 1
+        assert metrics.total_errors == 1
+
+    def test_recent_errors_after_ring_wraps(self, metrics):
+        """Test that the newest errors are returned oldest first once the ring wraps"""
+        total = metrics.ERROR_RING_SIZE + 10
+        for i in range(total):
+            metrics.record_error(MetricType.API_REQUEST, f"error {i}")
+
+        recent = metrics.get_recent_errors(5)
+
+        assert [e["error_message"] for e in recent] == [f"error {i}" for i in range(total - 5, total)]
+        assert recent[0]["metric_type"] == MetricType.API_REQUEST
+
+        everything = metrics.get_recent_errors(1000)
+        assert len(everything) == metrics.ERROR_RING_SIZE
+        assert everything[0]["error_message"] == f"error {total - metrics.ERROR_RING_SIZE}"
+        assert everything[-1]["error_message"] == f"error {total - 1}"
+        assert metrics.total_errors == total
+
+    def test_recent_errors_from_many_threads(self, metrics):
+        """Test that concurrent writers fill the ring without losing or reordering slots"""
+        def worker(n):
+            for i in range(200):
+                metrics.record_error(MetricType.API_REQUEST, f"worker {n} error {i}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        recent = metrics.get_recent_errors(1000)
+
+        assert metrics.total_errors == 1600
+        assert len(recent) == metrics.ERROR_RING_SIZE
+        assert len({e["error_message"] for e in recent}) == metrics.ERROR_RING_SIZE
+        for n in range(8):
+            indices = [int(e["error_message"].split()[-1]) for e in recent
+                       if e["error_message"].startswith(f"worker {n} ")]
+            assert indices == sorted(indices)
+
+
+class TestReset:
+    """Tests for resetting metrics"""
+
+    def test_reset_metrics(self, metrics):
+        """Test that reset drops counters, latencies, errors and cached summaries"""
+        metrics.record_count(MetricType.APPLICATION_SUBMISSION, 3)
+        metrics.record_latency(MetricType.FAISS_SEARCH, 12.5)
+        metrics.record_error(MetricType.FAISS_SEARCH, "index unavailable")
+        assert metrics.get_all_metrics()["total_errors"] == 1
+
+        metrics.reset_metrics()
+
+        assert metrics.get_counter(MetricType.APPLICATION_SUBMISSION) == 0
+        assert metrics.get_latency_stats(MetricType.FAISS_SEARCH)["count"] == 0
+        assert metrics.get_recent_errors() == []
+        assert metrics.get_error_rate() == 0.0
+        assert metrics.get_processing_rate() == 0.0
+
+        summary = metrics.get_all_metrics()
+        assert summary["counters"] == {}
+        assert summary["total_errors"] == 0
+
+        # The error ring starts over after a reset
+        metrics.record_error(MetricType.FAISS_SEARCH, "after reset")
+        assert [e["error_message"] for e in metrics.get_recent_errors()] == ["after reset"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
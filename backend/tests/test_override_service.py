@@ -0,0 +1,111 @@
+"""Unit tests for manual override service"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.application import ApplicationStatus
+from app.services.override_service import OverrideService, OverrideDecision
+
+
+JUSTIFICATION = "Different person after manual comparison"
+
+
+@pytest.fixture
+def override_service():
+    """Create override service instance"""
+    return OverrideService()
+
+
+def make_application(application_id, is_duplicate=True):
+    """Create a minimal application flagged as a duplicate"""
+    return SimpleNamespace(
+        application_id=application_id,
+        processing=SimpleNamespace(status=ApplicationStatus.DUPLICATE),
+        result=SimpleNamespace(is_duplicate=is_duplicate)
+    )
+
+
+def make_decision(application_id, decision=OverrideDecision.REJECT_DUPLICATE.value):
+    """Create a review decision for the bulk path"""
+    return {
+        "application_id": application_id,
+        "decision": decision,
+        "justification": JUSTIFICATION,
+        "admin_id": "admin-1"
+    }
+
+
+@pytest.fixture
+def mock_repo():
+    """Patch the application repository used by the override service"""
+    repo = MagicMock()
+    repo.get_many_by_ids = AsyncMock(return_value={
+        "app-001": make_application("app-001"),
+        "app-002": make_application("app-002")
+    })
+    repo.update_applications_bulk = AsyncMock(return_value=1)
+    with patch("app.services.override_service.ApplicationRepository", return_value=repo):
+        yield repo
+
+
+@pytest.fixture
+def mock_identity():
+    """Patch identity creation and audit logging"""
+    identity = AsyncMock(side_effect=lambda db, application_id, metadata: SimpleNamespace(
+        unique_id=f"identity-{application_id}"
+    ))
+    with patch("app.services.override_service.identity_service.create_identity", identity), \
+         patch("app.services.override_service.audit_service.log_many", AsyncMock()):
+        yield identity
+
+
+class TestBulkOverride:
+    """Tests for applying review decisions in bulk"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_application_in_batch(self, override_service, mock_repo, mock_identity):
+        """Test that only the first decision for an application is applied"""
+        outcomes = await override_service.apply_override_bulk([
+            make_decision("app-001"),
+            make_decision("app-001", OverrideDecision.APPROVE_DUPLICATE.value),
+            make_decision("app-002")
+        ], db=MagicMock())
+
+        assert outcomes[0]["new_status"] == ApplicationStatus.VERIFIED
+        assert isinstance(outcomes[1], ValueError)
+        assert "already has a decision" in str(outcomes[1])
+        assert outcomes[2]["success"] is True
+
+        # One identity per application, none for the rejected repeat
+        assert mock_identity.await_count == 2
+        status_updates = mock_repo.update_applications_bulk.await_args_list[0].args[0]
+        assert [application_id for application_id, _, _ in status_updates] == ["app-001", "app-002"]
+
+    @pytest.mark.asyncio
+    async def test_identities_created_after_bulk_write(self, override_service, mock_repo, mock_identity):
+        """Test that identities are created and linked only once the overrides are stored"""
+        calls = []
+        mock_repo.update_applications_bulk.side_effect = lambda updates: calls.append(("write", updates))
+        mock_identity.side_effect = lambda db, application_id, metadata: (
+            calls.append(("identity", application_id)) or SimpleNamespace(unique_id=f"identity-{application_id}")
+        )
+
+        await override_service.apply_override_bulk([make_decision("app-001")], db=MagicMock())
+
+        assert [kind for kind, _ in calls] == ["write", "identity", "write"]
+        assert calls[2][1] == [("app-001", None, {"identity_id": "identity-app-001"})]
+
+    @pytest.mark.asyncio
+    async def test_no_identity_when_bulk_write_fails(self, override_service, mock_repo, mock_identity):
+        """Test that a failed bulk write leaves no orphaned identities"""
+        mock_repo.update_applications_bulk.side_effect = RuntimeError("write failed")
+
+        with pytest.raises(RuntimeError):
+            await override_service.apply_override_bulk([make_decision("app-001")], db=MagicMock())
+
+        mock_identity.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])